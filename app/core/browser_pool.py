@@ -0,0 +1,202 @@
+import asyncio
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+
+from app.core.config import BROWSER_POOL_SIZE, BROWSER_MAX_USES, BROWSER_MAX_PAGES, BROWSER_HEADLESS
+from app.core.memory import memory_governor
+from app.core.metrics import timed
+
+
+class PooledBrowser:
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        # One warm context per storage state (None = anonymous, or an auth file path)
+        self.contexts = {}
+        self.uses = 0
+        # Pages opened since launch; renderer memory is only fully returned by relaunching
+        self.pages = 0
+        self.leased = False
+
+
+class BrowserPool:
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_uses: int = BROWSER_MAX_USES, headless: bool = BROWSER_HEADLESS,
+                 max_pages: int = BROWSER_MAX_PAGES):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_pages = max_pages
+        self.headless = headless
+        # Extra new_context() options and async hooks run on every new context (used by the benchmark harness)
+        self.context_options = {}
+        self.context_hooks = []
+        self._playwright = None
+        self._slots = []
+        self._idle = None
+        self._lock = asyncio.Lock()
+        self.leased = 0
+        self.leases_total = 0
+        self.recycled = 0
+        self.recycled_for_memory = 0
+        self.contexts_trimmed = 0
+
+    @property
+    def started(self):
+        return self._playwright is not None
+
+    async def start(self):
+        async with self._lock:
+            if self._playwright is not None:
+                return
+            self._playwright = await async_playwright().start()
+            self._idle = asyncio.Queue()
+            for i in range(self.size):
+                slot = PooledBrowser(i)
+                await self._launch(slot)
+                self._slots.append(slot)
+                self._idle.put_nowait(slot)
+            print(f"[INFO] Browser pool started with {self.size} browsers")
+
+    async def stop(self):
+        async with self._lock:
+            if self._playwright is None:
+                return
+            for slot in self._slots:
+                await self._close(slot)
+            self._slots = []
+            self._idle = None
+            await self._playwright.stop()
+            self._playwright = None
+            print("[INFO] Browser pool stopped")
+
+    async def _launch(self, slot: PooledBrowser):
+        with timed("browser_launch"):
+            slot.browser = await self._playwright.chromium.launch(headless=self.headless)
+        slot.contexts = {}
+        slot.uses = 0
+        slot.pages = 0
+
+    async def _close_contexts(self, slot: PooledBrowser):
+        # Close contexts explicitly so anything they record (HAR, traces) is flushed
+        for context in slot.contexts.values():
+            try:
+                await context.close()
+            except Exception:
+                pass
+        slot.contexts = {}
+
+    async def _close(self, slot: PooledBrowser):
+        await self._close_contexts(slot)
+        try:
+            if slot.browser:
+                await slot.browser.close()
+        except Exception:
+            pass
+        slot.browser = None
+
+    async def recycle(self, slot: PooledBrowser):
+        await self._close(slot)
+        await self._launch(slot)
+        self.recycled += 1
+
+    def _healthy(self, slot: PooledBrowser):
+        return slot.browser is not None and slot.browser.is_connected()
+
+    async def _context(self, slot: PooledBrowser, storage_state):
+        context = slot.contexts.get(storage_state)
+        if context is None:
+            context = await slot.browser.new_context(storage_state=storage_state, **self.context_options)
+            for hook in self.context_hooks:
+                await hook(context)
+            context.on("page", lambda _: setattr(slot, "pages", slot.pages + 1))
+            slot.contexts[storage_state] = context
+        return context
+
+    async def _release(self, slot: PooledBrowser):
+        slot.uses += 1
+        if not self._healthy(slot) or slot.uses >= self.max_uses or slot.pages >= self.max_pages:
+            await self.recycle(slot)
+            return
+        if memory_governor.under_pressure:
+            print(f"[INFO] Recycling browser {slot.index} under memory pressure")
+            self.recycled_for_memory += 1
+            await self.recycle(slot)
+            return
+        # Leave the warm contexts open but drop any pages the request left behind
+        for key, context in list(slot.contexts.items()):
+            try:
+                for page in context.pages:
+                    await page.close()
+            except Exception:
+                slot.contexts.pop(key, None)
+
+    @asynccontextmanager
+    async def lease(self, storage_state=None):
+        if not self.started:
+            await self.start()
+        idle = self._idle
+        slot = await idle.get()
+        slot.leased = True
+        self.leased += 1
+        self.leases_total += 1
+        try:
+            if not self._healthy(slot):
+                print(f"[WARN] Browser {slot.index} is not connected, relaunching")
+                await self.recycle(slot)
+            context = await self._context(slot, storage_state)
+            yield context
+        finally:
+            slot.leased = False
+            self.leased -= 1
+            try:
+                if self._playwright is not None:
+                    await self._release(slot)
+            except Exception as e:
+                print(f"[WARN] Could not release browser {slot.index}: {e}")
+            finally:
+                idle.put_nowait(slot)
+
+    async def trim(self):
+        # Memory relief: close the warm contexts (and their renderers) of browsers nobody is using.
+        # Idle slots are taken out of the queue meanwhile so no crawl leases one mid-close.
+        if self._idle is None:
+            return
+        slots = []
+        while not self._idle.empty():
+            slots.append(self._idle.get_nowait())
+        try:
+            for slot in slots:
+                if slot.contexts:
+                    await self._close_contexts(slot)
+                    self.contexts_trimmed += 1
+        finally:
+            for slot in slots:
+                self._idle.put_nowait(slot)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "max_uses": self.max_uses,
+            "max_pages": self.max_pages,
+            "started": self.started,
+            "leased": self.leased,
+            "idle": self._idle.qsize() if self._idle else 0,
+            "leases_total": self.leases_total,
+            "recycled": self.recycled,
+            "recycled_for_memory": self.recycled_for_memory,
+            "contexts_trimmed": self.contexts_trimmed,
+            "browsers": [
+                {
+                    "index": slot.index,
+                    "connected": self._healthy(slot),
+                    "leased": slot.leased,
+                    "uses": slot.uses,
+                    "pages": slot.pages,
+                    "contexts": len(slot.contexts),
+                }
+                for slot in self._slots
+            ],
+        }
+
+
+browser_pool = BrowserPool()
+memory_governor.add_relief(browser_pool.trim)
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+
+from app.core.config import CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES, CACHE_STALE_SECONDS, CACHE_BACKEND_URL
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry, ttl: float):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    # Shares cached results between uvicorn workers; needs the optional `redis` package
+    def __init__(self, url: str, prefix: str = "crawler-cache:"):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str):
+        raw = await self._redis.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, entry, ttl: float):
+        await self._redis.set(self.prefix + key, json.dumps(entry), ex=max(1, int(ttl)))
+
+    async def delete(self, key: str):
+        await self._redis.delete(self.prefix + key)
+
+
+def _log_failure(key: str):
+    def callback(task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[WARN] Crawl for {key} failed: {task.exception()}")
+    return callback
+
+
+def make_key(endpoint: str, **params):
+    normalized = []
+    for name, value in sorted(params.items()):
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = " ".join(value.lower().split())
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            # 48 and 48.0 are the same parameter: query strings coerce to float, models and literals keep ints
+            value = repr(float(value))
+        normalized.append(f"{name}={value}")
+    return f"{endpoint}?{'&'.join(normalized)}"
+
+
+class ResultCache:
+    def __init__(self, backend=None, ttl: float = CACHE_TTL_SECONDS, stale: float = CACHE_STALE_SECONDS):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        # Extra seconds an expired entry may still be served while it is refreshed in the background
+        self.stale = stale
+        self._in_flight = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key: str):
+        return await self.backend.get(key)
+
+    async def get_fresh(self, key: str):
+        entry = await self.backend.get(key)
+        if entry is not None and time.time() < entry["expires_at"]:
+            self.hits += 1
+            return entry["value"]
+        return None
+
+    async def put(self, key: str, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        entry = {"value": value, "stored_at": time.time(), "expires_at": time.time() + ttl}
+        await self.backend.set(key, entry, ttl + self.stale)
+        return entry
+
+    async def invalidate(self, key: str):
+        await self.backend.delete(key)
+
+    def _compute(self, key: str, compute, ttl: float = None):
+        # Single flight: concurrent callers for the same key share one task
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        async def run():
+            try:
+                value = await compute()
+                await self.put(key, value, ttl)
+                return value
+            finally:
+                self._in_flight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(_log_failure(key))
+        self._in_flight[key] = task
+        return task
+
+    async def get_or_compute(self, key: str, compute, refresh: bool = False, ttl: float = None):
+        entry = None if refresh else await self.backend.get(key)
+        now = time.time()
+        if entry is not None:
+            if now < entry["expires_at"]:
+                self.hits += 1
+                return entry["value"]
+            if now < entry["expires_at"] + self.stale:
+                self.stale_hits += 1
+                self._compute(key, compute, ttl)
+                return entry["value"]
+        self.misses += 1
+        # Shield the shared crawl so one disconnecting client does not cancel it for the others
+        return await asyncio.shield(self._compute(key, compute, ttl))
+
+    def stats(self):
+        return {
+            "ttl": self.ttl,
+            "stale": self.stale,
+            "entries": len(self.backend) if isinstance(self.backend, MemoryBackend) else None,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+def make_backend(url: str = CACHE_BACKEND_URL):
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisBackend(url)
+    return MemoryBackend()
+
+
+result_cache = ResultCache(make_backend())
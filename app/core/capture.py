@@ -0,0 +1,49 @@
+import asyncio
+
+from app.core.config import WAIT_MAX_MS
+
+
+class ResponseCapture:
+    """Collects the JSON bodies of page responses whose URL contains one of `patterns`."""
+
+    def __init__(self, page, patterns):
+        self.page = page
+        self.patterns = list(patterns)
+        self.payloads = []
+        self.failed = 0
+        self._pending = set()
+        self._arrived = asyncio.Event()
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if not any(pattern in response.url for pattern in self.patterns):
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response):
+        try:
+            self.payloads.append(await response.json())
+            self._arrived.set()
+        except Exception:
+            # Aborted, non-JSON or already evicted bodies
+            self.failed += 1
+
+    async def wait_for_growth(self, previous: int, timeout_ms: int = WAIT_MAX_MS):
+        # Return as soon as more than `previous` payloads arrived, or after timeout_ms
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        while len(self.payloads) <= previous:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return len(self.payloads)
+
+    def close(self):
+        self.page.remove_listener("response", self._on_response)
@@ -0,0 +1,115 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv('p.env')
+
+
+def env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def env_float(name, default):
+    return float(os.getenv(name, default))
+
+
+def env_bool(name, default):
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_list(name, default=""):
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+# Browser pool
+BROWSER_POOL_SIZE = env_int("BROWSER_POOL_SIZE", 2)
+BROWSER_MAX_USES = env_int("BROWSER_MAX_USES", 50)
+BROWSER_HEADLESS = env_bool("BROWSER_HEADLESS", True)
+BROWSER_MAX_PAGES = env_int("BROWSER_MAX_PAGES", 200)
+
+# Memory governor: RSS of the process plus its Playwright/Chromium children (0 = no limit)
+MEMORY_LIMIT_MB = env_float("MEMORY_LIMIT_MB", 0)
+MEMORY_WAIT_SECONDS = env_float("MEMORY_WAIT_SECONDS", 30)
+MEMORY_RECYCLE_RATIO = env_float("MEMORY_RECYCLE_RATIO", 0.8)
+MEMORY_SAMPLE_SECONDS = env_float("MEMORY_SAMPLE_SECONDS", 1)
+
+# Detail-page scheduling
+PAGE_MAX_IN_FLIGHT = env_int("PAGE_MAX_IN_FLIGHT", 8)
+PAGE_HOST_RATE = env_float("PAGE_HOST_RATE", 0)
+
+# Event-driven waits: upper bound for a single wait and DOM quiet period
+WAIT_MAX_MS = env_int("WAIT_MAX_MS", 4000)
+WAIT_QUIET_MS = env_int("WAIT_QUIET_MS", 400)
+
+# Lean page mode: abort images, media, fonts and tracker requests
+LEAN_MODE = env_bool("LEAN_MODE", False)
+LEAN_EXTRA_BLOCK_PATTERNS = env_list("LEAN_EXTRA_BLOCK_PATTERNS")
+
+# Scroll harvesting: stop once this many unique listing items were collected (0 = no limit)
+HARVEST_MAX_ITEMS = env_int("HARVEST_MAX_ITEMS", 0)
+
+# Pipelined crawls: enrich listing items while scrolling continues; scrolling waits while PIPELINE_QUEUE_SIZE
+# items are queued
+PIPELINE_MODE = env_bool("PIPELINE_MODE", False)
+PIPELINE_WORKERS = env_int("PIPELINE_WORKERS", 4)
+PIPELINE_QUEUE_SIZE = env_int("PIPELINE_QUEUE_SIZE", 8)
+
+# Capture mode: read search results from the JSON the page fetches instead of the rendered DOM
+CAPTURE_MODE = env_bool("CAPTURE_MODE", False)
+
+# Browserless watch-page metadata
+YOUTUBE_BASE_URL = os.getenv("YOUTUBE_BASE_URL", "https://www.youtube.com").rstrip("/")
+YOUTUBE_HTTP_FAST_PATH = env_bool("YOUTUBE_HTTP_FAST_PATH", True)
+HTTP_MAX_CONNECTIONS = env_int("HTTP_MAX_CONNECTIONS", 20)
+HTTP_TIMEOUT = env_float("HTTP_TIMEOUT", 15)
+
+# Crawl result cache
+CACHE_TTL_SECONDS = env_float("CACHE_TTL_SECONDS", 900)
+CACHE_STALE_SECONDS = env_float("CACHE_STALE_SECONDS", 0)
+CACHE_MAX_ENTRIES = env_int("CACHE_MAX_ENTRIES", 256)
+CACHE_BACKEND_URL = os.getenv("CACHE_BACKEND_URL", "memory://")
+
+# Background crawl jobs
+JOB_WORKERS = env_int("JOB_WORKERS", 2)
+JOB_QUEUE_SIZE = env_int("JOB_QUEUE_SIZE", 20)
+JOB_RETENTION_SECONDS = env_float("JOB_RETENTION_SECONDS", 3600)
+
+# Twitter thread pages fetched in parallel per crawl
+TWITTER_REPLY_CONCURRENCY = env_int("TWITTER_REPLY_CONCURRENCY", 4)
+
+# Per-URL enrichment cache (publish dates, comments, replies)
+ENRICH_DB_PATH = os.getenv("ENRICH_DB_PATH", "storage/enrichment.sqlite3")
+ENRICH_DATE_TTL = env_float("ENRICH_DATE_TTL", 30 * 24 * 3600)
+ENRICH_COMMENTS_TTL = env_float("ENRICH_COMMENTS_TTL", 6 * 3600)
+ENRICH_REPLIES_TTL = env_float("ENRICH_REPLIES_TTL", 6 * 3600)
+
+# Engagement history: snapshots of every crawled video/tweet, written in batches
+ENGAGEMENT_DB_PATH = os.getenv("ENGAGEMENT_DB_PATH", "storage/engagement.sqlite3")
+ENGAGEMENT_BATCH_SIZE = env_int("ENGAGEMENT_BATCH_SIZE", 200)
+ENGAGEMENT_FLUSH_SECONDS = env_float("ENGAGEMENT_FLUSH_SECONDS", 30)
+
+# Batch crawls
+BATCH_CONCURRENCY = env_int("BATCH_CONCURRENCY", 2)
+
+# Pre-warming: popular queries/niches crawled on a schedule into the result cache
+PREWARM_YOUTUBE_QUERIES = env_list("PREWARM_YOUTUBE_QUERIES")
+PREWARM_TWITTER_NICHES = env_list("PREWARM_TWITTER_NICHES")
+PREWARM_INTERVAL_SECONDS = env_float("PREWARM_INTERVAL_SECONDS", 600)
+PREWARM_JITTER_SECONDS = env_float("PREWARM_JITTER_SECONDS", 60)
+PREWARM_CONCURRENCY = env_int("PREWARM_CONCURRENCY", 1)
+
+# Worker processes: crawls run in N processes, each with its own Playwright and browser pool (0 = in the API process)
+WORKER_PROCESSES = env_int("WORKER_PROCESSES", 0)
+WORKER_RESTART_DELAY = env_float("WORKER_RESTART_DELAY", 1)
+
+# Deadline-aware crawls: share of a request's `deadline` given to loading the listing and to scrolling;
+# enrichment gets the rest
+DEADLINE_LISTING_SHARE = env_float("DEADLINE_LISTING_SHARE", 0.2)
+DEADLINE_SCROLL_SHARE = env_float("DEADLINE_SCROLL_SHARE", 0.3)
+
+# Crawl engine: "pool" (browser pool + page scheduler) or "crawlee" (persistent, resumable request queue
+# with LISTING/DETAIL handlers and crawlee's autoscaled pool)
+CRAWL_ENGINE = os.getenv("CRAWL_ENGINE", "pool").strip().lower()
+FRONTIER_MIN_CONCURRENCY = env_int("FRONTIER_MIN_CONCURRENCY", 1)
+FRONTIER_MAX_CONCURRENCY = env_int("FRONTIER_MAX_CONCURRENCY", 8)
+FRONTIER_MAX_RETRIES = env_int("FRONTIER_MAX_RETRIES", 2)
+FRONTIER_MEMORY_RATIO = env_float("FRONTIER_MEMORY_RATIO", 0.25)
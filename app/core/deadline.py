@@ -0,0 +1,87 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.core.config import DEADLINE_LISTING_SHARE, DEADLINE_SCROLL_SHARE
+from app.core.progress import report
+
+_deadline = ContextVar("crawl_deadline", default=None)
+
+
+class Deadline:
+    """A crawl's time budget, split into consecutive listing, scroll and enrich stages.
+
+    Each stage may run until its cumulative share of the budget has elapsed
+    (time a stage leaves unused carries over to the next one); enrich runs to
+    the end of the budget.
+    """
+
+    def __init__(self, seconds: float, listing_share: float = DEADLINE_LISTING_SHARE, scroll_share: float = DEADLINE_SCROLL_SHARE):
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.stage_ends = {
+            "listing": self.started_at + seconds * listing_share,
+            "scroll": self.started_at + seconds * (listing_share + scroll_share),
+            "enrich": self.started_at + seconds,
+        }
+        self.complete = True
+        self.cut_stages = []
+
+    def time_left(self, stage: str = "enrich"):
+        return max(0.0, self.stage_ends[stage] - time.monotonic())
+
+    def expired(self, stage: str = "enrich"):
+        return self.time_left(stage) <= 0
+
+    def mark_incomplete(self, stage: str):
+        if stage not in self.cut_stages:
+            self.cut_stages.append(stage)
+            print(f"[INFO] Deadline of {self.seconds}s cut the {stage} stage short")
+        self.complete = False
+        report("incomplete", stage=stage, deadline=self.seconds)
+
+
+@contextmanager
+def deadline_scope(seconds: float = None):
+    # No deadline (None) leaves every helper below a no-op
+    deadline = Deadline(seconds) if seconds else None
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline():
+    return _deadline.get()
+
+
+def time_left(stage: str, default: float = None):
+    # Seconds the stage may still take: `default` capped by the deadline, None when neither applies
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    left = deadline.time_left(stage)
+    return left if default is None else min(default, left)
+
+
+def timeout_ms(stage: str, default_ms: int):
+    # Playwright timeout for one call, capped by the deadline (Playwright treats 0 as "no timeout")
+    left = time_left(stage)
+    if left is None:
+        return default_ms
+    return max(1, min(default_ms, int(left * 1000)))
+
+
+def stage_expired(stage: str):
+    deadline = _deadline.get()
+    if deadline is not None and deadline.expired(stage):
+        deadline.mark_incomplete(stage)
+        return True
+    return False
+
+
+def mark_incomplete(stage: str):
+    deadline = _deadline.get()
+    if deadline is not None:
+        deadline.mark_incomplete(stage)
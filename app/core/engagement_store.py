@@ -0,0 +1,192 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.config import ENGAGEMENT_BATCH_SIZE, ENGAGEMENT_DB_PATH, ENGAGEMENT_FLUSH_SECONDS
+
+METRICS = ("views", "likes", "retweets", "replies")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS engagement (
+    site TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    niche TEXT NOT NULL,
+    captured_at REAL NOT NULL,
+    views INTEGER,
+    likes INTEGER,
+    retweets INTEGER,
+    replies INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_engagement_item ON engagement (site, item_id, captured_at);
+CREATE INDEX IF NOT EXISTS idx_engagement_niche ON engagement (site, niche, captured_at);
+CREATE INDEX IF NOT EXISTS idx_engagement_captured_at ON engagement (captured_at);
+CREATE TABLE IF NOT EXISTS engagement_items (
+    site TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    title TEXT,
+    url TEXT,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (site, item_id)
+);
+"""
+
+_INSERT = """
+INSERT INTO engagement (site, item_id, niche, captured_at, views, likes, retweets, replies)
+VALUES (:site, :item_id, :niche, :captured_at, :views, :likes, :retweets, :replies)
+"""
+
+_UPSERT_ITEM = """
+INSERT INTO engagement_items (site, item_id, title, url, last_seen)
+VALUES (:site, :item_id, :title, :url, :captured_at)
+ON CONFLICT (site, item_id) DO UPDATE SET
+    title = COALESCE(excluded.title, title),
+    url = COALESCE(excluded.url, url),
+    last_seen = excluded.last_seen
+"""
+
+# First and last snapshot of every item inside the window; {metric} is one of METRICS
+_MOVERS = """
+WITH snapshots AS (
+    SELECT item_id, captured_at, {metric} AS value,
+           ROW_NUMBER() OVER (PARTITION BY item_id ORDER BY captured_at) AS first_rank,
+           ROW_NUMBER() OVER (PARTITION BY item_id ORDER BY captured_at DESC) AS last_rank,
+           COUNT(*) OVER (PARTITION BY item_id) AS count
+    FROM engagement
+    WHERE site = :site AND captured_at >= :since AND {metric} IS NOT NULL {niche_filter}
+)
+SELECT first.item_id, first.value AS first_value, last.value AS last_value,
+       first.captured_at AS first_at, last.captured_at AS last_at, first.count AS snapshots,
+       items.title, items.url
+FROM snapshots AS first
+JOIN snapshots AS last ON last.item_id = first.item_id AND last.last_rank = 1
+LEFT JOIN engagement_items AS items ON items.site = :site AND items.item_id = first.item_id
+WHERE first.first_rank = 1 AND last.captured_at > first.captured_at
+ORDER BY (last.value - first.value) / (last.captured_at - first.captured_at) DESC
+LIMIT :limit
+"""
+
+
+class EngagementStore:
+    """Timestamped engagement snapshots per video/tweet, appended by every crawl.
+
+    Snapshots are buffered and written in one transaction once `batch_size` rows are
+    pending or `flush_seconds` have passed since the last write. Worker processes
+    flush after every crawl, since /movers only sees the API process's buffer.
+    """
+
+    def __init__(self, path: str = ENGAGEMENT_DB_PATH, batch_size: int = ENGAGEMENT_BATCH_SIZE,
+                 flush_seconds: float = ENGAGEMENT_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._conn = None
+        self._lock = threading.Lock()
+        self._pending = []
+        self._flushed_at = time.monotonic()
+        self.recorded = 0
+        self.written = 0
+        self.flushes = 0
+
+    def _connect(self):
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+            self._flushed_at = time.monotonic()
+            if not rows:
+                return
+            conn = self._connect()
+            with conn:
+                conn.executemany(_INSERT, rows)
+                conn.executemany(_UPSERT_ITEM, rows)
+            self.written += len(rows)
+            self.flushes += 1
+
+    async def record(self, site: str, niche: str, items):
+        # items: dicts with "id" and any of METRICS, plus optional "title"/"url"
+        now = time.time()
+        niche = " ".join(niche.lower().split())
+        rows = []
+        for item in items:
+            if not item.get("id"):
+                continue
+            rows.append({
+                "site": site,
+                "item_id": item["id"],
+                "niche": niche,
+                "captured_at": now,
+                **{metric: item.get(metric) for metric in METRICS},
+                "title": item.get("title"),
+                "url": item.get("url"),
+            })
+        with self._lock:
+            self._pending.extend(rows)
+        self.recorded += len(rows)
+        if len(self._pending) >= self.batch_size or time.monotonic() - self._flushed_at >= self.flush_seconds:
+            await asyncio.to_thread(self._flush)
+
+    async def flush(self):
+        if self._pending:
+            await asyncio.to_thread(self._flush)
+
+    def _movers(self, site: str, metric: str, window_hours: float, niche: str = None, limit: int = 20):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self._flush()
+        params = {"site": site, "since": time.time() - window_hours * 3600, "limit": limit}
+        niche_filter = ""
+        if niche:
+            niche_filter = "AND niche = :niche"
+            params["niche"] = " ".join(niche.lower().split())
+        query = _MOVERS.format(metric=metric, niche_filter=niche_filter)
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+        movers = []
+        for row in rows:
+            hours = (row["last_at"] - row["first_at"]) / 3600
+            delta = row["last_value"] - row["first_value"]
+            movers.append({
+                "item_id": row["item_id"],
+                "title": row["title"],
+                "url": row["url"],
+                "metric": metric,
+                "first": row["first_value"],
+                "last": row["last_value"],
+                "delta": delta,
+                "hours": round(hours, 3),
+                "per_hour": round(delta / hours, 2),
+                "snapshots": row["snapshots"],
+            })
+        return movers
+
+    async def movers(self, site: str, metric: str = "views", window_hours: float = 24, niche: str = None, limit: int = 20):
+        return await asyncio.to_thread(self._movers, site, metric, window_hours, niche, limit)
+
+    def close(self):
+        self._flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "written": self.written,
+            "flushes": self.flushes,
+        }
+
+
+engagement_store = EngagementStore()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.config import ENRICH_DB_PATH, ENRICH_DATE_TTL, ENRICH_COMMENTS_TTL, ENRICH_REPLIES_TTL
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    published TEXT,
+    published_fetched_at REAL,
+    comments TEXT,
+    comments_disabled INTEGER,
+    comments_fetched_at REAL,
+    replies TEXT,
+    replies_fetched_at REAL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_enrichment_fetched_at ON enrichment (fetched_at);
+"""
+
+_UPSERT = """
+INSERT INTO enrichment (url, kind, published, published_fetched_at, comments, comments_disabled,
+                        comments_fetched_at, replies, replies_fetched_at, fetched_at)
+VALUES (:url, :kind, :published, :published_fetched_at, :comments, :comments_disabled,
+        :comments_fetched_at, :replies, :replies_fetched_at, :fetched_at)
+ON CONFLICT (url) DO UPDATE SET
+    published = COALESCE(excluded.published, published),
+    published_fetched_at = COALESCE(excluded.published_fetched_at, published_fetched_at),
+    comments = COALESCE(excluded.comments, comments),
+    comments_disabled = COALESCE(excluded.comments_disabled, comments_disabled),
+    comments_fetched_at = COALESCE(excluded.comments_fetched_at, comments_fetched_at),
+    replies = COALESCE(excluded.replies, replies),
+    replies_fetched_at = COALESCE(excluded.replies_fetched_at, replies_fetched_at),
+    fetched_at = excluded.fetched_at
+"""
+
+
+class EnrichmentStore:
+    def __init__(self, path: str = ENRICH_DB_PATH, date_ttl: float = ENRICH_DATE_TTL,
+                 comments_ttl: float = ENRICH_COMMENTS_TTL, replies_ttl: float = ENRICH_REPLIES_TTL):
+        self.path = path
+        self.ttls = {"published": date_ttl, "comments": comments_ttl, "replies": replies_ttl}
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _get(self, url: str):
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM enrichment WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return {}
+        now = time.time()
+        fresh = {}
+        # Each field has its own freshness: a publish date never changes, comments drift
+        for field in ("published", "comments", "replies"):
+            fetched_at = row[f"{field}_fetched_at"]
+            if row[field] is None or fetched_at is None or now - fetched_at > self.ttls[field]:
+                continue
+            fresh[field] = row[field] if field == "published" else json.loads(row[field])
+            if field == "comments":
+                fresh["comments_disabled"] = bool(row["comments_disabled"])
+        return fresh
+
+    def _put(self, url: str, kind: str, published=None, comments=None, comments_disabled=None, replies=None):
+        now = time.time()
+        params = {
+            "url": url,
+            "kind": kind,
+            "published": published,
+            "published_fetched_at": now if published is not None else None,
+            "comments": json.dumps(comments) if comments is not None else None,
+            "comments_disabled": int(comments_disabled) if comments is not None else None,
+            "comments_fetched_at": now if comments is not None else None,
+            "replies": json.dumps(replies) if replies is not None else None,
+            "replies_fetched_at": now if replies is not None else None,
+            "fetched_at": now,
+        }
+        with self._lock:
+            conn = self._connect()
+            conn.execute(_UPSERT, params)
+            conn.commit()
+
+    async def get(self, url: str):
+        fresh = await asyncio.to_thread(self._get, url)
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return fresh
+
+    async def put(self, url: str, kind: str, **fields):
+        await asyncio.to_thread(self._put, url, kind, **fields)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self):
+        return {"path": self.path, "ttls": self.ttls, "hits": self.hits, "misses": self.misses}
+
+
+enrichment_store = EnrichmentStore()
@@ -0,0 +1,79 @@
+# Bulk DOM extraction: each helper is a single page.evaluate that returns plain JSON
+# for every matching item, instead of one CDP round trip per selector/attribute.
+# With fresh=True only items not returned before are read, and they get marked, so
+# a scroll loop can harvest each newly mounted batch before the timeline unmounts it.
+# The marker is passed in as an argument so waits.wait_for_new_elements looks for the same one.
+
+SEEN_ATTRIBUTE = "data-crawler-seen"
+
+_YOUTUBE_LISTING_JS = """([fresh, seen]) => Array.from(document.querySelectorAll(
+    fresh ? `ytd-video-renderer:not([${seen}])` : 'ytd-video-renderer'
+)).map(video => {
+    if (fresh) video.setAttribute(seen, '');
+    const title = video.querySelector('#video-title');
+    return {
+        title: title ? title.innerText : null,
+        href: title ? title.getAttribute('href') : null,
+        meta: Array.from(video.querySelectorAll('span.inline-metadata-item')).map(span => span.innerText),
+    };
+})"""
+
+_TWEETS_JS = """([labels, fresh, seen]) => Array.from(document.querySelectorAll(
+    fresh ? `article:not([${seen}])` : 'article'
+)).map(article => {
+    if (fresh) article.setAttribute(seen, '');
+    const text = selector => {
+        const el = article.querySelector(selector);
+        return el ? el.innerText : null;
+    };
+    const engagement = {};
+    for (const label of labels) {
+        engagement[label] = text(`[aria-label*="${label}"]`);
+    }
+    const time = article.querySelector('time');
+    const link = article.querySelector('a[href*="/status/"]');
+    return {
+        text: article.innerText,
+        engagement: engagement,
+        retweet: text('[data-testid="retweet"]'),
+        datetime: time ? time.getAttribute('datetime') : null,
+        href: link ? link.getAttribute('href') : null,
+    };
+})"""
+
+_TEXTS_JS = """([selector, limit]) => Array.from(document.querySelectorAll(selector))
+    .slice(0, limit === null ? undefined : limit)
+    .map(el => el.innerText)"""
+
+_WATCH_PAGE_JS = """() => {
+    const text = selector => {
+        const el = document.querySelector(selector);
+        return el ? el.innerText : null;
+    };
+    const meta = document.querySelector('meta[itemprop="datePublished"]');
+    return {
+        info_date: text('div#info-strings yt-formatted-string'),
+        shorts_date: text('span.ytd-video-primary-info-renderer'),
+        meta_date: meta ? meta.getAttribute('content') : null,
+        comment_count: text('h2#count, ytd-comments-header-renderer #count'),
+        message: text('ytd-message-renderer, #message'),
+    };
+}"""
+
+TWEET_ENGAGEMENT_LABELS = ["Reply", "Retweet", "Repost", "Like", "View"]
+
+
+async def extract_youtube_listing(page, fresh: bool = False):
+    return await page.evaluate(_YOUTUBE_LISTING_JS, [fresh, SEEN_ATTRIBUTE])
+
+
+async def extract_tweets(page, labels=TWEET_ENGAGEMENT_LABELS, fresh: bool = False):
+    return await page.evaluate(_TWEETS_JS, [labels, fresh, SEEN_ATTRIBUTE])
+
+
+async def extract_texts(page, selector: str, limit: int = None):
+    return await page.evaluate(_TEXTS_JS, [selector, limit])
+
+
+async def extract_watch_metadata(page):
+    return await page.evaluate(_WATCH_PAGE_JS)
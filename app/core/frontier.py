@@ -0,0 +1,116 @@
+import asyncio
+import fcntl
+import hashlib
+import os
+from datetime import timedelta
+
+from crawlee import ConcurrencySettings, Request
+from crawlee.configuration import Configuration
+from crawlee.crawlers import PlaywrightCrawler, PlaywrightCrawlingContext
+from crawlee.storages import Dataset, KeyValueStore, RequestQueue
+
+from app.core.config import (
+    BROWSER_HEADLESS, FRONTIER_MAX_CONCURRENCY, FRONTIER_MAX_RETRIES, FRONTIER_MEMORY_RATIO, FRONTIER_MIN_CONCURRENCY,
+)
+from app.core.lean import prepare_page
+
+LISTING = "LISTING"
+DETAIL = "DETAIL"
+
+
+def detail_request(url: str, **user_data):
+    return Request.from_url(url, label=DETAIL, user_data=user_data)
+
+
+class Frontier:
+    """Crawlee storages for one crawl: request queue, result dataset and a state store.
+
+    They are named after the crawl's parameters and live on disk (CRAWLEE_STORAGE_DIR),
+    so an interrupted crawl with the same parameters picks up its queue and the results
+    it already has instead of starting over. They are dropped once a crawl finishes.
+
+    Used as `async with`: a lock file per name makes a second crawl with the same
+    parameters (in this or another worker process) wait until the first one is done,
+    instead of sharing its queue and losing it to the first one's drop().
+    """
+
+    def __init__(self, site: str, key: str):
+        self.site = site
+        self.name = f"{site}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}"
+        self.queue = None
+        self.dataset = None
+        self.state = None
+        self._lock_file = None
+
+    async def _lock(self):
+        lock_dir = os.path.join(os.getenv("CRAWLEE_STORAGE_DIR", "./storage"), "frontier-locks")
+        os.makedirs(lock_dir, exist_ok=True)
+        self._lock_file = open(os.path.join(lock_dir, f"{self.name}.lock"), "w")
+        # Polled rather than a blocking flock() in a thread, so a cancelled crawl never acquires it late
+        while True:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                await asyncio.sleep(0.5)
+            except BaseException:
+                self._unlock()
+                raise
+
+    def _unlock(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def __aenter__(self):
+        await self._lock()
+        try:
+            return await self.open()
+        except BaseException:
+            self._unlock()
+            raise
+
+    async def __aexit__(self, *exc):
+        self._unlock()
+
+    async def open(self):
+        self.queue = await RequestQueue.open(name=self.name)
+        self.dataset = await Dataset.open(name=self.name)
+        self.state = await KeyValueStore.open(name=self.name)
+        handled = await self.queue.get_handled_count()
+        if handled:
+            print(f"[INFO] Resuming crawl {self.name}: {handled} requests already handled")
+        return self
+
+    def crawler(self, lean: bool = None, **options):
+        # The autoscaled pool scales between min and max concurrency based on CPU and memory headroom
+        crawler = PlaywrightCrawler(
+            request_manager=self.queue,
+            concurrency_settings=ConcurrencySettings(
+                min_concurrency=FRONTIER_MIN_CONCURRENCY,
+                max_concurrency=FRONTIER_MAX_CONCURRENCY,
+                desired_concurrency=FRONTIER_MIN_CONCURRENCY,
+            ),
+            configuration=Configuration(available_memory_ratio=FRONTIER_MEMORY_RATIO),
+            max_request_retries=FRONTIER_MAX_RETRIES,
+            request_handler_timeout=timedelta(minutes=2),
+            headless=BROWSER_HEADLESS,
+            browser_type="chromium",
+            **options,
+        )
+
+        @crawler.pre_navigation_hook
+        async def lean_mode(context: PlaywrightCrawlingContext):
+            await prepare_page(context.page, self.site, lean)
+
+        return crawler
+
+    async def run(self, crawler, start_url: str, user_data=None):
+        # An already handled LISTING request is deduplicated by the queue, so a resumed crawl only works off what is left
+        await crawler.run([Request.from_url(start_url, label=LISTING, user_data=user_data or {})])
+        return (await self.dataset.get_data(limit=100_000)).items
+
+    async def drop(self):
+        for storage in (self.queue, self.dataset, self.state):
+            if storage is not None:
+                await storage.drop()
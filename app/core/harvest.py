@@ -0,0 +1,62 @@
+from app.core.config import HARVEST_MAX_ITEMS
+
+
+class Harvester:
+    """Collects listing items across scroll steps and decides when scrolling can stop.
+
+    Items are deduped by key(item); items without a key are dropped, since a
+    remounted copy could not be told apart. Listings here are newest first, so
+    once `patience` new items in a row fall outside the time window nothing
+    further down can qualify.
+
+    With `discovered`, new items are also handed to that coroutine by hand_off()
+    after each scroll step, e.g. to start enriching them while scrolling goes on.
+    """
+
+    def __init__(self, key, target: int = HARVEST_MAX_ITEMS, outside_window=None, patience: int = 3, discovered=None):
+        self.key = key
+        self.discovered = discovered
+        self._pending = []
+        self.target = target
+        self.outside_window = outside_window
+        self.patience = patience
+        self.items = []
+        self.duplicates = 0
+        self._seen = set()
+        self._outside_streak = 0
+
+    def add(self, items):
+        new = []
+        for item in items:
+            key = self.key(item)
+            if key is None:
+                continue
+            if key in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(key)
+            new.append(item)
+            if self.outside_window is not None:
+                self._outside_streak = self._outside_streak + 1 if self.outside_window(item) else 0
+        self.items.extend(new)
+        if self.discovered is not None:
+            self._pending.extend(new)
+        return new
+
+    async def hand_off(self):
+        if self.discovered is None or not self._pending:
+            return
+        new, self._pending = self._pending, []
+        await self.discovered(new)
+
+    @property
+    def past_window(self):
+        return self._outside_streak >= self.patience
+
+    @property
+    def target_reached(self):
+        return bool(self.target) and len(self.items) >= self.target
+
+    @property
+    def done(self):
+        return self.target_reached or self.past_window
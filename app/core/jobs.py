@@ -0,0 +1,157 @@
+import asyncio
+import time
+import uuid
+
+from app.core.config import JOB_WORKERS, JOB_QUEUE_SIZE, JOB_RETENTION_SECONDS
+from app.core.progress import listen
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind: str, params: dict):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = "queued"
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+        self.cancel_requested = False
+
+    @property
+    def finished(self):
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def on_progress(self, event: str, data: dict):
+        self.progress = {"stage": event, **data}
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    def __init__(self, workers: int = JOB_WORKERS, max_queue: int = JOB_QUEUE_SIZE, retention: float = JOB_RETENTION_SECONDS):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retention = retention
+        self._runners = {}
+        self._jobs = {}
+        self._queue = None
+        self._worker_tasks = []
+        self.running = 0
+
+    def register(self, kind: str, runner):
+        self._runners[kind] = runner
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        for job in self._jobs.values():
+            if job.task is not None:
+                job.task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+
+    def _purge(self):
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self._jobs.items()):
+            if job.finished and job.finished_at < cutoff:
+                del self._jobs[job_id]
+
+    def submit(self, kind: str, params: dict):
+        if kind not in self._runners:
+            raise KeyError(kind)
+        if self._queue is None:
+            raise RuntimeError("Job manager is not started")
+        self._purge()
+        job = Job(kind, params)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"Job queue is full ({self.max_queue} queued)")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+        job.cancel_requested = True
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            job.status = "cancelled"
+            job.finished_at = time.time()
+        return job
+
+    async def _run(self, job: Job):
+        with listen(job.on_progress):
+            return await self._runners[job.kind](**job.params)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status == "cancelled":
+                    continue
+                job.status = "running"
+                job.started_at = time.time()
+                self.running += 1
+                job.task = asyncio.create_task(self._run(job))
+                try:
+                    job.result = await job.task
+                    job.status = "succeeded"
+                except asyncio.CancelledError:
+                    job.status = "cancelled"
+                    # Only a cancel() of this job is absorbed; stop() cancelling the worker must end it
+                    if not job.cancel_requested or asyncio.current_task().cancelling():
+                        raise
+                except Exception as e:
+                    job.status = "failed"
+                    job.error = str(e)
+                    print(f"[ERROR] Job {job.id} ({job.kind}) failed: {e}")
+                finally:
+                    self.running -= 1
+                    job.finished_at = time.time()
+                    job.task = None
+            finally:
+                self._queue.task_done()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": self.running,
+            "jobs": len(self._jobs),
+        }
+
+
+job_manager = JobManager()
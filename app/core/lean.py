@@ -0,0 +1,110 @@
+from app.core.config import LEAN_MODE, LEAN_EXTRA_BLOCK_PATTERNS
+from app.core.metrics import pages_opened
+
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+BLOCKED_URL_PATTERNS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "/pagead/",
+    "/ptracking",
+    "/api/stats/",
+    "/youtubei/v1/log_event",
+    "googlevideo.com",
+    "ads-twitter.com",
+    "analytics.twitter.com",
+    "/i/jot",
+    "/1.1/jot/",
+    "video.twimg.com",
+] + LEAN_EXTRA_BLOCK_PATTERNS
+
+# Requests the extractors depend on; never blocked even if they match a rule above
+SITE_ALLOWLISTS = {
+    "youtube": ["/youtubei/v1/search", "/youtubei/v1/next", "/youtubei/v1/browse", "/youtubei/v1/player"],
+    "twitter": ["/i/api/graphql/", "/i/api/2/", "abs.twimg.com/responsive-web/"],
+}
+
+lean_totals = {"pages": 0, "requests_blocked": 0, "requests_allowed": 0, "bytes_received": 0}
+
+
+class LeanStats:
+    def __init__(self, site: str):
+        self.site = site
+        self.requests_blocked = 0
+        self.requests_allowed = 0
+        self.blocked_by_type = {}
+        self.bytes_received = 0
+
+    def as_dict(self):
+        return {
+            "site": self.site,
+            "requests_blocked": self.requests_blocked,
+            "requests_allowed": self.requests_allowed,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "bytes_received": self.bytes_received,
+        }
+
+
+def _should_block(request, site: str):
+    url = request.url
+    if any(pattern in url for pattern in SITE_ALLOWLISTS.get(site, [])):
+        return False
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    return any(pattern in url for pattern in BLOCKED_URL_PATTERNS)
+
+
+async def apply_lean_mode(page, site: str):
+    stats = LeanStats(site)
+
+    async def handle(route):
+        request = route.request
+        if _should_block(request, site):
+            stats.requests_blocked += 1
+            stats.blocked_by_type[request.resource_type] = stats.blocked_by_type.get(request.resource_type, 0) + 1
+            await route.abort("blockedbyclient")
+        else:
+            stats.requests_allowed += 1
+            # fallback() rather than continue_() so context-level routes (e.g. HAR replay) still see the request
+            await route.fallback()
+
+    def on_response(response):
+        # Aborted requests never report a size, so track what was actually transferred
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            stats.bytes_received += int(length)
+
+    def on_close(_):
+        lean_totals["pages"] += 1
+        lean_totals["requests_blocked"] += stats.requests_blocked
+        lean_totals["requests_allowed"] += stats.requests_allowed
+        lean_totals["bytes_received"] += stats.bytes_received
+        print(f"[DEBUG] Lean page {page.url}: {stats.as_dict()}")
+
+    await page.route("**/*", handle)
+    page.on("response", on_response)
+    page.once("close", on_close)
+    return stats
+
+
+async def release_media(page):
+    try:
+        await page.evaluate("""() => document.querySelectorAll('video, audio').forEach(media => {
+            media.pause();
+            media.removeAttribute('src');
+            media.load();
+        })""")
+    except Exception:
+        pass
+
+
+async def prepare_page(page, site: str, lean: bool = None):
+    pages_opened.inc(site=site)
+    if lean is None:
+        lean = LEAN_MODE
+    if not lean:
+        return None
+    return await apply_lean_mode(page, site)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+try:
+    import psutil
+except ImportError:  # memory limits are disabled without psutil
+    psutil = None
+
+from app.core.config import MEMORY_LIMIT_MB, MEMORY_RECYCLE_RATIO, MEMORY_SAMPLE_SECONDS, MEMORY_WAIT_SECONDS
+
+
+class MemoryLimitExceeded(Exception):
+    pass
+
+
+class MemoryGovernor:
+    """Keeps the RSS of this process plus its children (the Playwright driver and Chromium) under a limit.
+
+    New pages wait while usage is above the limit, asking the registered relief callbacks
+    (e.g. the browser pool closing idle contexts) to free memory, and are refused once
+    `wait_seconds` pass. Browsers are recycled on release while usage is above
+    `recycle_ratio` of the limit.
+    """
+
+    def __init__(self, limit_mb: float = MEMORY_LIMIT_MB, wait_seconds: float = MEMORY_WAIT_SECONDS,
+                 recycle_ratio: float = MEMORY_RECYCLE_RATIO, sample_seconds: float = MEMORY_SAMPLE_SECONDS):
+        self.limit = int(limit_mb * 1024 * 1024)
+        self.wait_seconds = wait_seconds
+        self.recycle_ratio = recycle_ratio
+        self.sample_seconds = sample_seconds
+        self._reliefs = []
+        self._sample = None
+        self._sampled_at = 0.0
+        self.peak = 0
+        self.waited = 0
+        self.refused = 0
+        self.reliefs_run = 0
+        if self.limit and psutil is None:
+            print("[WARN] MEMORY_LIMIT_MB is set but psutil is not installed; memory limits are disabled")
+
+    @property
+    def enabled(self):
+        return bool(self.limit) and psutil is not None
+
+    def add_relief(self, callback):
+        self._reliefs.append(callback)
+
+    def usage(self):
+        # -> {"process": bytes, "children": bytes, "processes": n}; sampling walks the process tree, so it is cached briefly
+        if psutil is None:
+            return None
+        now = time.monotonic()
+        if self._sample is not None and now - self._sampled_at < self.sample_seconds:
+            return self._sample
+        process = psutil.Process()
+        own = process.memory_info().rss
+        children = 0
+        count = 0
+        for child in process.children(recursive=True):
+            try:
+                children += child.memory_info().rss
+                count += 1
+            except psutil.Error:
+                pass
+        self._sample = {"process": own, "children": children, "processes": count + 1}
+        self._sampled_at = now
+        self.peak = max(self.peak, own + children)
+        return self._sample
+
+    def rss(self):
+        usage = self.usage()
+        return usage["process"] + usage["children"] if usage else 0
+
+    def _refresh(self):
+        self._sample = None
+        return self.rss()
+
+    @property
+    def over_limit(self):
+        return self.enabled and self.rss() >= self.limit
+
+    @property
+    def under_pressure(self):
+        # Past this point released browsers are relaunched instead of kept warm
+        return self.enabled and self.rss() >= self.limit * self.recycle_ratio
+
+    async def relieve(self):
+        self.reliefs_run += 1
+        for callback in self._reliefs:
+            try:
+                await callback()
+            except Exception as e:
+                print(f"[WARN] Memory relief failed: {e}")
+
+    async def admit(self):
+        # Called before opening a page: waits while over the limit, then refuses
+        if not self.over_limit:
+            return
+        self.waited += 1
+        print(f"[WARN] Memory at {self.rss() // 2**20} MB (limit {self.limit // 2**20} MB), holding page open")
+        await self.relieve()
+        deadline = time.monotonic() + self.wait_seconds
+        while self._refresh() >= self.limit:
+            if time.monotonic() >= deadline:
+                self.refused += 1
+                raise MemoryLimitExceeded(
+                    f"Crawler memory {self.rss() // 2**20} MB is above the {self.limit // 2**20} MB limit"
+                )
+            await asyncio.sleep(max(self.sample_seconds, 0.25))
+
+    def stats(self):
+        usage = self.usage() or {}
+        return {
+            "enabled": self.enabled,
+            "limit_mb": self.limit // 2**20,
+            "rss_mb": self.rss() // 2**20,
+            "process_mb": usage.get("process", 0) // 2**20,
+            "children_mb": usage.get("children", 0) // 2**20,
+            "processes": usage.get("processes", 0),
+            "peak_mb": self.peak // 2**20,
+            "waited": self.waited,
+            "refused": self.refused,
+            "reliefs_run": self.reliefs_run,
+        }
+
+
+memory_governor = MemoryGovernor()
@@ -0,0 +1,118 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield self.name, key, value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets=_DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._values = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self):
+        for key, (counts, total, count) in self._values.items():
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", key + (("le", bound),), bucket_count
+            yield f"{self.name}_bucket", key + (("le", "+Inf"),), count
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, count
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, collect):
+        # collect() returns {labels tuple: value}, read at scrape time
+        self.name = name
+        self.help = help_text
+        self.collect = collect
+
+    def samples(self):
+        for key, value in self.collect().items():
+            yield self.name, key, value
+
+
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{_label_text(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+stage_seconds = register(Histogram("crawler_stage_seconds", "Time spent in each crawl stage"))
+pages_opened = register(Counter("crawler_pages_opened_total", "Browser pages opened by the crawlers"))
+items_skipped = register(Counter("crawler_items_skipped_total", "Listing items dropped before they reached the results"))
+timeouts = register(Counter("crawler_timeouts_total", "Playwright timeouts hit while crawling"))
+retries = register(Counter("crawler_retries_total", "Work retried through a slower path"))
+
+_trace = ContextVar("crawl_trace", default=None)
+
+
+@contextmanager
+def tracing():
+    spans = []
+    token = _trace.set(spans)
+    try:
+        yield spans
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def timed(stage: str, **details):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=stage)
+        spans = _trace.get()
+        if spans is not None:
+            spans.append({"stage": stage, "seconds": round(elapsed, 4), **details})
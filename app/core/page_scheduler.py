@@ -0,0 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from app.core.config import PAGE_MAX_IN_FLIGHT, PAGE_HOST_RATE
+from app.core.memory import memory_governor
+
+
+class PageScheduler:
+    def __init__(self, max_in_flight: int = PAGE_MAX_IN_FLIGHT, host_rate: float = PAGE_HOST_RATE):
+        self.max_in_flight = max_in_flight
+        # Page opens per second allowed per host; 0 disables rate limiting
+        self.host_rate = host_rate
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._host_locks = {}
+        self._host_next = {}
+        self.in_flight = 0
+        self.queued = 0
+        self.opened_total = 0
+
+    async def _throttle(self, url: str):
+        if self.host_rate <= 0 or not url:
+            return
+        host = urlparse(url).netloc
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            delay = self._host_next.get(host, 0) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._host_next[host] = loop.time() + 1 / self.host_rate
+
+    @asynccontextmanager
+    async def page(self, context, url: str = None):
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        page = None
+        try:
+            # Above the memory limit the page waits for usage to drop and is refused after MEMORY_WAIT_SECONDS
+            await memory_governor.admit()
+            await self._throttle(url)
+            page = await context.new_page()
+            self.opened_total += 1
+            yield page
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self):
+        return {
+            "max_in_flight": self.max_in_flight,
+            "host_rate": self.host_rate,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "opened_total": self.opened_total,
+        }
+
+
+page_scheduler = PageScheduler()
@@ -0,0 +1,60 @@
+import re
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+
+def parse_views(views_text: str):
+    try:
+        views = views_text.replace(' views', '').replace(' view', '').replace(',', '').strip()
+        if 'K' in views:
+            return int(float(views.replace('K', '')) * 1_000)
+        elif 'M' in views:
+            return int(float(views.replace('M', '')) * 1_000_000)
+        elif 'B' in views:
+            return int(float(views.replace('B', '')) * 1_000_000_000)
+        return int(views)
+    except Exception:
+        return 0
+
+
+def video_id(path: str):
+    # "/watch?v=abc&t=1s" or "/shorts/abc" -> "abc"
+    if not path:
+        return None
+    parts = urlsplit(path)
+    if parts.path.startswith("/shorts/"):
+        return parts.path.split("/")[2] or None
+    return (parse_qs(parts.query).get("v") or [None])[0]
+
+
+def status_id(url: str):
+    # ".../user/status/123/analytics" -> "123"
+    match = re.search(r"/status/(\d+)", url or "")
+    return match.group(1) if match else None
+
+
+def upload_age(upload_text: str):
+    # "3 hours ago", "Streamed 2 days ago", ... -> timedelta, or None if the text is not relative
+    if not upload_text:
+        return None
+    match = re.search(r"(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago", upload_text)
+    if not match:
+        return None
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def is_within_window(upload_text: str, window_hours: float = 48):
+    age = upload_age(upload_text)
+    if age is None:
+        return False
+    return age <= timedelta(hours=window_hours)
@@ -0,0 +1,122 @@
+import re
+from datetime import datetime
+
+# Parsers for the JSON the sites fetch themselves (YouTube ytInitialData/search
+# continuations, Twitter GraphQL SearchTimeline/TweetDetail). They only read
+# plain dicts, so recorded payloads can be fed to them directly.
+
+YOUTUBE_SEARCH_PATTERNS = ["/youtubei/v1/search"]
+TWITTER_SEARCH_PATTERNS = ["/SearchTimeline"]
+TWITTER_DETAIL_PATTERNS = ["/TweetDetail"]
+
+_TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+
+
+def _walk(data, key: str):
+    # Yield every value stored under `key`, in document order, without descending into matches
+    if isinstance(data, dict):
+        for name, value in data.items():
+            if name == key:
+                yield value
+            else:
+                yield from _walk(value, key)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _walk(item, key)
+
+
+def runs_text(value):
+    # YouTube text objects: a plain string, {"simpleText": ...} or {"runs": [{"text": ...}, ...]}
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        if "simpleText" in value:
+            return value["simpleText"]
+        if "runs" in value:
+            return "".join(run.get("text", "") for run in value["runs"])
+    return None
+
+
+def _count(value):
+    # Exact counts: 1234, "1234", "1,234 views"; "No views" and missing values are 0
+    if isinstance(value, int):
+        return value
+    digits = re.sub(r"\D", "", str(value or ""))
+    return int(digits) if digits else 0
+
+
+def youtube_videos(payload):
+    """Search results from ytInitialData or a /youtubei/v1/search continuation."""
+    videos = []
+    for renderer in _walk(payload, "videoRenderer"):
+        video_id = renderer.get("videoId")
+        if not video_id:
+            continue
+        videos.append({
+            "id": video_id,
+            "title": runs_text(renderer.get("title")) or "",
+            "path": f"/watch?v={video_id}",
+            "views": _count(runs_text(renderer.get("viewCountText"))),
+            "uploaded": runs_text(renderer.get("publishedTimeText")),
+            "length": runs_text(renderer.get("lengthText")),
+            "channel": runs_text(renderer.get("ownerText")),
+        })
+    return videos
+
+
+def youtube_has_more(payload):
+    # Search pages end with a continuation item while more results can be loaded
+    return next(_walk(payload, "continuationItemRenderer"), None) is not None
+
+
+def _tweet_result(result):
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet") or {}
+    return result if result.get("legacy") else None
+
+
+def _tweet(result):
+    legacy = result["legacy"]
+    user = ((result.get("core") or {}).get("user_results") or {}).get("result") or {}
+    screen_name = (user.get("legacy") or {}).get("screen_name") or (user.get("core") or {}).get("screen_name")
+    note = ((result.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result") or {}
+    tweet_id = legacy.get("id_str") or result.get("rest_id")
+    created_at = None
+    if legacy.get("created_at"):
+        try:
+            created_at = datetime.strptime(legacy["created_at"], _TWITTER_DATE_FORMAT).isoformat()
+        except ValueError:
+            pass
+    return {
+        "id": tweet_id,
+        "text": note.get("text") or legacy.get("full_text") or "",
+        "date": created_at[:10] if created_at else None,
+        "created_at": created_at,
+        "author": screen_name,
+        "url": f"https://twitter.com/{screen_name}/status/{tweet_id}" if screen_name and tweet_id else None,
+        "replies": _count(legacy.get("reply_count")),
+        "retweets": _count(legacy.get("retweet_count")),
+        "likes": _count(legacy.get("favorite_count")),
+        "quotes": _count(legacy.get("quote_count")),
+        "views": _count((result.get("views") or {}).get("count")),
+        "conversation_id": legacy.get("conversation_id_str"),
+        "in_reply_to": legacy.get("in_reply_to_status_id_str"),
+    }
+
+
+def twitter_tweets(payload):
+    """Tweets of a SearchTimeline or TweetDetail response, in timeline order."""
+    tweets = []
+    for tweet_results in _walk(payload, "tweet_results"):
+        result = _tweet_result((tweet_results or {}).get("result") or {})
+        if result is not None:
+            tweets.append(_tweet(result))
+    return tweets
+
+
+def twitter_replies(payload, tweet_id: str, limit: int = 3):
+    """Direct replies to `tweet_id` from a TweetDetail response, in the order Twitter ranks them."""
+    return [
+        tweet for tweet in twitter_tweets(payload)
+        if tweet["id"] != tweet_id and tweet["in_reply_to"] == tweet_id
+    ][:limit]
@@ -0,0 +1,88 @@
+import asyncio
+import itertools
+from contextlib import nullcontext
+
+from app.core.config import PIPELINE_QUEUE_SIZE, PIPELINE_WORKERS
+
+_DONE = object()
+
+
+class Pipeline:
+    """Bounded producer/consumer queue between a scroll loop and detail-page workers.
+
+    put() waits while the queue is full, so discovery only runs ahead of enrichment
+    by `size` items. Each worker may hold a resource for its whole life (e.g. a
+    long-lived page), opened by `scope()` and passed to `consume(state, item)`;
+    without a scope, consume(item) is called. With `priority`, the queued item with
+    the lowest priority(item) is consumed first instead of the oldest.
+    """
+
+    def __init__(self, consume, workers: int = PIPELINE_WORKERS, size: int = PIPELINE_QUEUE_SIZE, scope=None,
+                 priority=None):
+        self._consume = consume
+        self._scope = scope
+        self._priority = priority
+        self._order = itertools.count()
+        self.queue = asyncio.PriorityQueue(size) if priority else asyncio.Queue(size)
+        self.queued = 0
+        self.processed = 0
+        self.failed = False
+        self._alive = workers
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(workers)]
+
+    async def _work(self):
+        try:
+            async with (self._scope() if self._scope else nullcontext()) as state:
+                while True:
+                    item = await self.queue.get()
+                    if self._priority:
+                        item = item[2]
+                    if item is _DONE:
+                        return
+                    try:
+                        await (self._consume(state, item) if self._scope else self._consume(item))
+                    except Exception as e:
+                        print(f"[WARN] Pipeline item failed: {e}")
+                    finally:
+                        self.processed += 1
+        except Exception as e:
+            print(f"[ERROR] Pipeline worker failed: {e}")
+        finally:
+            self._alive -= 1
+            if not self._alive:
+                # Nobody left to consume: unblock the producer and drop what it puts from now on
+                self.failed = True
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+
+    async def put(self, item):
+        if self.failed:
+            return False
+        self.queued += 1
+        await self._put(item)
+        return True
+
+    async def _put(self, item):
+        if self._priority:
+            # The counter keeps equal priorities in arrival order and never compares the items themselves
+            rank = float("inf") if item is _DONE else self._priority(item)
+            item = (rank, next(self._order), item)
+        await self.queue.put(item)
+
+    async def close(self, timeout: float = None):
+        # No more items: let the workers drain the queue; -> False if the timeout cut them off
+        async def finish():
+            for _ in self._tasks:
+                await self._put(_DONE)
+
+        feeder = asyncio.ensure_future(finish())
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        feeder.cancel()
+        if pending:
+            await self.cancel()
+        return not pending
+
+    async def cancel(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,154 @@
+import asyncio
+import random
+import time
+
+from app.core.cache import result_cache
+from app.core.config import PREWARM_INTERVAL_SECONDS, PREWARM_JITTER_SECONDS, PREWARM_CONCURRENCY
+
+
+class PrewarmTarget:
+    def __init__(self, kind: str, name: str, key: str, compute):
+        self.kind = kind
+        self.name = name
+        self.key = key
+        self.compute = compute
+        self.next_run_at = None
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.last_started_at = None
+        self.last_refreshed_at = None
+        self.last_duration = None
+        self.last_error = None
+
+    def as_dict(self):
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "key": self.key,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_started_at": self.last_started_at,
+            "last_refreshed_at": self.last_refreshed_at,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "age": round(time.time() - self.last_refreshed_at, 1) if self.last_refreshed_at else None,
+            "next_run_at": self.next_run_at,
+        }
+
+
+class PrewarmScheduler:
+    """Re-crawls registered targets on an interval into the shared result cache.
+
+    Runs go through result_cache.get_or_compute, so a pre-warm and a user
+    request for the same key share one crawl, and the endpoints serve the
+    result from the cache like any other.
+    """
+
+    def __init__(self, interval: float = PREWARM_INTERVAL_SECONDS, jitter: float = PREWARM_JITTER_SECONDS,
+                 concurrency: int = PREWARM_CONCURRENCY, cache=result_cache):
+        self.interval = interval
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.cache = cache
+        self.targets = {}
+        self._semaphore = None
+        self._wakeup = None
+        self._loop_task = None
+        self._tasks = set()
+
+    def add(self, kind: str, name: str, key: str, compute):
+        self.targets[(kind, name)] = PrewarmTarget(kind, name, key, compute)
+
+    @property
+    def ttl(self):
+        # Keep pre-warmed entries fresh until the next refresh has had time to land
+        return max(self.cache.ttl, self.interval + self.jitter)
+
+    def _next_run(self):
+        return time.time() + max(0.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    async def start(self):
+        if self._loop_task is not None or not self.targets:
+            return
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        now = time.time()
+        for target in self.targets.values():
+            # Spread the first round so startup does not crawl everything at once
+            target.next_run_at = now + random.uniform(0, self.jitter)
+        self._loop_task = asyncio.create_task(self._loop())
+        print(f"[INFO] Pre-warming {len(self.targets)} targets every {self.interval:.0f}s")
+
+    async def stop(self):
+        tasks = list(self._tasks)
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._tasks = set()
+
+    def trigger(self, kind: str = None, name: str = None):
+        matched = [
+            target for target in self.targets.values()
+            if (kind is None or target.kind == kind) and (name is None or target.name == name)
+        ]
+        now = time.time()
+        for target in matched:
+            target.next_run_at = now
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return matched
+
+    async def _loop(self):
+        while True:
+            now = time.time()
+            for target in self.targets.values():
+                if not target.running and target.next_run_at <= now:
+                    target.running = True
+                    task = asyncio.create_task(self._run(target))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            pending = [t.next_run_at for t in self.targets.values() if not t.running]
+            timeout = max(0.0, min(pending) - now) if pending else self.interval
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, target: PrewarmTarget):
+        try:
+            async with self._semaphore:
+                target.last_started_at = time.time()
+                try:
+                    await self.cache.get_or_compute(target.key, target.compute, refresh=True, ttl=self.ttl)
+                    target.last_refreshed_at = time.time()
+                    target.last_duration = round(target.last_refreshed_at - target.last_started_at, 3)
+                    target.last_error = None
+                except Exception as e:
+                    target.failures += 1
+                    target.last_error = str(e)
+                    print(f"[WARN] Pre-warm of {target.kind} {target.name!r} failed: {e}")
+                target.runs += 1
+        finally:
+            target.running = False
+            target.next_run_at = self._next_run()
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "jitter": self.jitter,
+            "concurrency": self.concurrency,
+            "started": self._loop_task is not None,
+            "targets": len(self.targets),
+            "running": sum(1 for target in self.targets.values() if target.running),
+        }
+
+
+prewarm_scheduler = PrewarmScheduler()
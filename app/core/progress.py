@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Crawlers report progress here; whoever started the crawl (a job, a stream) decides what to do with it
+_listener = ContextVar("crawl_progress_listener", default=None)
+
+
+def report(event: str, **data):
+    listener = _listener.get()
+    if listener is not None:
+        listener(event, data)
+
+
+def current_listener():
+    return _listener.get()
+
+
+@contextmanager
+def listen(callback):
+    token = _listener.set(callback)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
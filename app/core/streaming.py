@@ -0,0 +1,73 @@
+import asyncio
+import json
+from fastapi.responses import StreamingResponse
+
+from app.core.progress import listen
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def encode_event(event: str, data, fmt: str):
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    if fmt == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False, default=str) + "\n"
+
+
+async def crawl_events(run, on_complete=None):
+    # Runs the crawl in its own task and yields (event, data) pairs as items qualify
+    queue = asyncio.Queue()
+    cut = []
+
+    def on_progress(event: str, data: dict):
+        if event == "item":
+            queue.put_nowait(("item", data["item"]))
+        elif event == "incomplete":
+            # A deadline cut a stage short
+            cut.append(data)
+            queue.put_nowait(("incomplete", data))
+
+    async def crawl():
+        try:
+            with listen(on_progress):
+                return await run()
+        finally:
+            queue.put_nowait(None)
+
+    task = asyncio.create_task(crawl())
+    try:
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            yield message
+        try:
+            results = await task
+        except Exception as e:
+            yield "error", {"detail": str(e)}
+            return
+        if on_complete is not None and not cut:
+            await on_complete(results)
+        yield "summary", {"results": results, "complete": not cut, "cached": False}
+    finally:
+        # The client went away: stop the crawl instead of finishing it for nobody
+        if not task.done():
+            task.cancel()
+
+
+async def cached_events(results):
+    # Only complete results are cached; same summary shape as crawl_events
+    for item in results:
+        yield "item", item
+    yield "summary", {"results": results, "complete": True, "cached": True}
+
+
+def stream_response(events, fmt: str = "ndjson"):
+    async def body():
+        async for event, data in events:
+            yield encode_event(event, data, fmt)
+
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[fmt], headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
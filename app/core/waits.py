@@ -0,0 +1,68 @@
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.core.config import WAIT_MAX_MS, WAIT_QUIET_MS
+from app.core.extract import SEEN_ATTRIBUTE
+
+_COUNT_JS = "selector => document.querySelectorAll(selector).length"
+
+_GROWTH_JS = "([selector, previous]) => document.querySelectorAll(selector).length > previous"
+
+_FRESH_JS = "([selector, attribute]) => document.querySelector(`${selector}:not([${attribute}])`) !== null"
+
+# Resolves once the DOM has gone `quiet` ms without a mutation, or after `timeout` ms
+_SETTLE_JS = """([quiet, timeout]) => new Promise(resolve => {
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quiet, true);
+    });
+    const deadline = setTimeout(done, timeout, false);
+    function done(settled) {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(deadline);
+        resolve(settled);
+    }
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    timer = setTimeout(done, quiet, true);
+})"""
+
+
+async def count_elements(page, selector: str):
+    return await page.evaluate(_COUNT_JS, selector)
+
+
+async def wait_for_dom_settle(page, quiet_ms: int = WAIT_QUIET_MS, timeout_ms: int = WAIT_MAX_MS):
+    try:
+        return await page.evaluate(_SETTLE_JS, [quiet_ms, timeout_ms])
+    except Exception:
+        return False
+
+
+async def wait_for_count_growth(page, selector: str, previous: int, timeout_ms: int = WAIT_MAX_MS, quiet_ms: int = WAIT_QUIET_MS):
+    # Return as soon as more matches are mounted, then give the batch a moment to finish rendering
+    try:
+        await page.wait_for_function(_GROWTH_JS, arg=[selector, previous], timeout=timeout_ms, polling="raf")
+    except PlaywrightTimeoutError:
+        return await count_elements(page, selector)
+    await wait_for_dom_settle(page, quiet_ms=quiet_ms, timeout_ms=quiet_ms * 4)
+    return await count_elements(page, selector)
+
+
+async def wait_for_new_elements(page, selector: str, timeout_ms: int = WAIT_MAX_MS, quiet_ms: int = WAIT_QUIET_MS):
+    # Like wait_for_count_growth, but for virtualized lists whose length stays flat:
+    # waits for an element the fresh=True extractors have not marked yet
+    try:
+        await page.wait_for_function(_FRESH_JS, arg=[selector, SEEN_ATTRIBUTE], timeout=timeout_ms, polling="raf")
+    except PlaywrightTimeoutError:
+        return False
+    await wait_for_dom_settle(page, quiet_ms=quiet_ms, timeout_ms=quiet_ms * 4)
+    return True
+
+
+async def wait_for_any(page, selectors, timeout_ms: int = WAIT_MAX_MS):
+    try:
+        await page.wait_for_selector(", ".join(selectors), state="attached", timeout=timeout_ms)
+        return True
+    except PlaywrightTimeoutError:
+        return False
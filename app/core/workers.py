@@ -0,0 +1,291 @@
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+import traceback
+
+from app.core.config import WORKER_PROCESSES, WORKER_RESTART_DELAY
+from app.core.progress import current_listener, listen
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+class WorkerError(Exception):
+    pass
+
+
+async def _serve(index: int, tasks, results):
+    # Runs inside the worker process: one event loop, one Playwright, one browser pool
+    from app.core.browser_pool import browser_pool
+    from app.core.engagement_store import engagement_store
+    from app.core.enrichment_store import enrichment_store
+    from app.services.youtube_http import close_http_client
+
+    running = {}
+
+    async def run(task_id, fn, args, kwargs):
+        def forward(event: str, data: dict):
+            results.put(("event", task_id, event, data))
+
+        try:
+            with listen(forward):
+                result = await fn(*args, **kwargs)
+            results.put(("done", task_id, result))
+        except asyncio.CancelledError:
+            results.put(("error", task_id, "cancelled"))
+        except Exception as e:
+            traceback.print_exc()
+            results.put(("error", task_id, f"{type(e).__name__}: {e}"))
+        finally:
+            running.pop(task_id, None)
+            # Buffered snapshots would stay invisible to /movers until this worker's next crawl
+            try:
+                await engagement_store.flush()
+            except Exception as e:
+                print(f"[WARN] Could not flush engagement snapshots: {e}")
+
+    await browser_pool.start()
+    results.put(("ready", index))
+    try:
+        while True:
+            message = await asyncio.to_thread(tasks.get)
+            if message[0] == "stop":
+                break
+            if message[0] == "run":
+                _, task_id, fn, args, kwargs = message
+                running[task_id] = asyncio.create_task(run(task_id, fn, args, kwargs))
+            elif message[0] == "cancel" and message[1] in running:
+                running[message[1]].cancel()
+    finally:
+        for task in list(running.values()):
+            task.cancel()
+        await asyncio.gather(*running.values(), return_exceptions=True)
+        await browser_pool.stop()
+        await close_http_client()
+        enrichment_store.close()
+        engagement_store.close()
+
+
+def _worker_main(index: int, tasks, results):
+    try:
+        asyncio.run(_serve(index, tasks, results))
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerProcess:
+    def __init__(self, index: int):
+        self.index = index
+        self.process = None
+        self.tasks = None
+        self.in_flight = set()
+        self.restarting = False
+        self.started_at = None
+        self.restarts = 0
+        self.completed = 0
+
+
+class WorkerPool:
+    """Runs crawl coroutines in separate processes, each with its own Playwright.
+
+    Calls are sent over multiprocessing queues as (function, args, kwargs), so the
+    function must be importable (a module-level coroutine function). Progress
+    events are forwarded back to the caller's progress listener, so jobs and
+    streams work the same as in-process crawls.
+    """
+
+    def __init__(self, processes: int = WORKER_PROCESSES, restart_delay: float = WORKER_RESTART_DELAY):
+        self.processes = processes
+        self.restart_delay = restart_delay
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers = []
+        self._results = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._loop = None
+        self._reader = None
+        self._monitor = None
+        self._respawned = asyncio.Event()
+        self.crashes = 0
+
+    @property
+    def enabled(self):
+        return self.processes > 0
+
+    @property
+    def started(self):
+        return self._results is not None
+
+    @property
+    def in_flight(self):
+        return len(self._pending)
+
+    def _spawn(self, worker: WorkerProcess):
+        worker.tasks = self._ctx.Queue()
+        worker.process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker.index, worker.tasks, self._results),
+            name=f"crawler-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+        worker.started_at = time.time()
+
+    async def start(self):
+        if self.started or not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._results = self._ctx.Queue()
+        self._workers = [WorkerProcess(i) for i in range(self.processes)]
+        for worker in self._workers:
+            self._spawn(worker)
+        self._reader = threading.Thread(target=self._read_results, name="crawler-worker-results", daemon=True)
+        self._reader.start()
+        self._monitor = asyncio.create_task(self._watch())
+        print(f"[INFO] Started {self.processes} crawler worker processes")
+
+    async def stop(self):
+        if not self.started:
+            return
+        self._monitor.cancel()
+        await asyncio.gather(self._monitor, return_exceptions=True)
+        for worker in self._workers:
+            worker.tasks.put(("stop",))
+        for worker in self._workers:
+            await asyncio.to_thread(worker.process.join, 15)
+            if worker.process.is_alive():
+                worker.process.kill()
+        self._results.put(None)
+        await asyncio.to_thread(self._reader.join, 5)
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                future.set_exception(WorkerCrashed("Worker pool stopped"))
+        self._pending = {}
+        self._workers = []
+        self._results = None
+        # Wake calls waiting for a restart so they fail instead of hanging
+        self._respawned.set()
+        print("[INFO] Crawler worker processes stopped")
+
+    def _read_results(self):
+        # Blocking reads happen on this thread; handling goes back to the event loop
+        while True:
+            try:
+                message = self._results.get()
+            except (EOFError, OSError):
+                return
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._handle, message)
+
+    def _handle(self, message):
+        kind = message[0]
+        if kind == "ready":
+            return
+        entry = self._pending.get(message[1])
+        if entry is None:
+            return
+        future, worker, listener = entry
+        if kind == "event":
+            if listener is not None:
+                listener(message[2], message[3])
+            return
+        self._pending.pop(message[1], None)
+        worker.in_flight.discard(message[1])
+        worker.completed += 1
+        if future.done():
+            return
+        if kind == "done":
+            future.set_result(message[2])
+        else:
+            future.set_exception(WorkerError(message[2]))
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(1)
+            for worker in self._workers:
+                if worker.process.is_alive():
+                    continue
+                self.crashes += 1
+                worker.restarting = True
+                print(f"[WARN] Crawler worker {worker.index} exited with code {worker.process.exitcode}, restarting")
+                for task_id in list(worker.in_flight):
+                    future, _, _ = self._pending.pop(task_id, (None, None, None))
+                    if future is not None and not future.done():
+                        future.set_exception(WorkerCrashed(f"Worker {worker.index} crashed while running the crawl"))
+                worker.in_flight.clear()
+                await asyncio.sleep(self.restart_delay)
+                self._spawn(worker)
+                worker.restarts += 1
+                worker.restarting = False
+                self._respawned.set()
+
+    async def _pick(self):
+        # Least busy live worker. A dead one is never picked: its queue is replaced on restart
+        # (a killed reader can leave the old one locked), so a call sent there would be lost.
+        # With every worker down, hold the call until _watch has restarted one.
+        while True:
+            if not self.started:
+                raise WorkerCrashed("Worker pool stopped")
+            live = [w for w in self._workers if not w.restarting and w.process.is_alive()]
+            if live:
+                return min(live, key=lambda w: len(w.in_flight))
+            self._respawned.clear()
+            await self._respawned.wait()
+
+    async def run(self, fn, *args, **kwargs):
+        if not self.started:
+            await self.start()
+        worker = await self._pick()
+        task_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[task_id] = (future, worker, current_listener())
+        worker.in_flight.add(task_id)
+        worker.tasks.put(("run", task_id, fn, args, kwargs))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if task_id in self._pending:
+                worker.tasks.put(("cancel", task_id))
+                self._pending.pop(task_id, None)
+                worker.in_flight.discard(task_id)
+            raise
+
+    def stats(self):
+        return {
+            "processes": self.processes,
+            "started": self.started,
+            "in_flight": self.in_flight,
+            "crashes": self.crashes,
+            "workers": [
+                {
+                    "index": worker.index,
+                    "pid": worker.process.pid if worker.process else None,
+                    "alive": bool(worker.process and worker.process.is_alive()),
+                    "in_flight": len(worker.in_flight),
+                    "completed": worker.completed,
+                    "restarts": worker.restarts,
+                }
+                for worker in self._workers
+            ],
+        }
+
+
+worker_pool = WorkerPool()
+
+
+async def dispatch(fn, *args, **kwargs):
+    # Run a crawl in a worker process when WORKER_PROCESSES is set, otherwise right here
+    if worker_pool.enabled:
+        return await worker_pool.run(fn, *args, **kwargs)
+    return await fn(*args, **kwargs)
+
+
+def dispatched(fn):
+    async def runner(*args, **kwargs):
+        return await dispatch(fn, *args, **kwargs)
+    runner.__name__ = fn.__name__
+    return runner
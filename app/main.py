@@ -1,9 +1,59 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import crawler
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.core.browser_pool import browser_pool
+from app.core.engagement_store import engagement_store
+from app.core.enrichment_store import enrichment_store
+from app.core.jobs import job_manager
+from app.core.memory import MemoryLimitExceeded, memory_governor
+from app.core.metrics import Gauge, register, render
+from app.core.page_scheduler import page_scheduler
+from app.core.prewarm import prewarm_scheduler
+from app.core.workers import worker_pool
+from app.routers import crawler, engagement, jobs, prewarm
+from app.services.youtube_http import close_http_client
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if worker_pool.enabled:
+        # Each worker process runs its own browser pool
+        await worker_pool.start()
+    else:
+        await browser_pool.start()
+    await job_manager.start()
+    await prewarm_scheduler.start()
+    yield
+    await prewarm_scheduler.stop()
+    await job_manager.stop()
+    await worker_pool.stop()
+    await browser_pool.stop()
+    await close_http_client()
+    enrichment_store.close()
+    engagement_store.close()
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(crawler.router)
+app.include_router(jobs.router)
+app.include_router(prewarm.router)
+app.include_router(engagement.router)
+
+register(Gauge("crawler_browsers_leased", "Pooled browsers currently leased", lambda: {(): browser_pool.leased}))
+register(Gauge("crawler_pages_in_flight", "Detail pages currently open", lambda: {(): page_scheduler.in_flight}))
+register(Gauge("crawler_pages_queued", "Detail pages waiting for a scheduler slot", lambda: {(): page_scheduler.queued}))
+register(Gauge("crawler_worker_tasks", "Crawls running in worker processes", lambda: {(): worker_pool.in_flight}))
+register(Gauge("crawler_memory_rss_bytes", "RSS of the API process and its browser processes",
+               lambda: {(): memory_governor.rss()}))
+register(Gauge("crawler_jobs_running", "Background crawl jobs running", lambda: {(): job_manager.running}))
+
+@app.exception_handler(MemoryLimitExceeded)
+async def memory_limit_exceeded(request, exc: MemoryLimitExceeded):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "30"})
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to your FastAPI app!"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
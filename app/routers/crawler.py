@@ -1,15 +1,144 @@
-from fastapi import APIRouter
+from typing import Literal, Optional
+from fastapi import APIRouter, Query
+from app.core.browser_pool import browser_pool
+from app.core.cache import make_key, result_cache
+from app.core.engagement_store import engagement_store
+from app.core.enrichment_store import enrichment_store
+from app.core.jobs import job_manager
+from app.core.lean import lean_totals
+from app.core.memory import memory_governor
+from app.core.metrics import tracing
+from app.core.page_scheduler import page_scheduler
+from app.core.progress import listen
+from app.core.prewarm import prewarm_scheduler
+from app.core.streaming import cached_events, crawl_events, stream_response
+from app.core.workers import dispatch, worker_pool
+from app.schemas.crawl import BatchCrawlParams, EnrichParams
+from app.services.batch_service import run_batch_crawl
 from app.services.crawler_service import run_youtube_crawler
+from app.services.enrichment_service import run_enrichment
 from app.services.twitter_niche_service import run_twitter_niche_crawler
 
 router = APIRouter()
 
+
+# Cache keys for the GET endpoints; batch and pre-warm store under the same keys so the GETs serve their results
+def youtube_key(query: str, top_k: int = 5, window_hours: float = 48.0, include_comments: bool = True):
+    return make_key("youtube_crawler", query=query, top_k=top_k, window_hours=window_hours, include_comments=include_comments)
+
+
+def twitter_key(niche: str, include_replies: bool = True):
+    return make_key("twitter_niche_crawler", niche=niche, include_replies=include_replies)
+
+
+async def _cached_crawl(key: str, run, refresh: bool, deadline: Optional[float]):
+    # -> (results, complete). Deadline-bound crawls run on their own instead of joining a shared
+    # single-flight crawl, and only complete results are cached.
+    if deadline is None:
+        return await result_cache.get_or_compute(key, run, refresh=refresh), True
+    cached = None if refresh else await result_cache.get_fresh(key)
+    if cached is not None:
+        return cached, True
+    cut = []
+    with listen(lambda event, data: cut.append(data) if event == "incomplete" else None):
+        results = await run()
+    if not cut:
+        await result_cache.put(key, results)
+    return results, not cut
+
+
+def _response(results, complete: bool, deadline: Optional[float], spans, trace: bool):
+    if not trace and deadline is None:
+        return results
+    body = {"results": results}
+    if deadline is not None:
+        body["complete"] = complete
+    if trace:
+        body["trace"] = spans
+    return body
+
 @router.get("/youtube_crawler")
-async def crawl(query: str):
-    results = await run_youtube_crawler(query)
-    return results
+async def crawl(query: str, top_k: int = 5, window_hours: float = 48.0, include_comments: bool = True, lean: Optional[bool] = None,
+                deadline: Optional[float] = Query(None, gt=0), refresh: bool = False, trace: bool = False):
+    key = youtube_key(query, top_k, window_hours, include_comments)
+    with tracing() as spans:
+        results, complete = await _cached_crawl(
+            key,
+            lambda: dispatch(run_youtube_crawler, query, top_k=top_k, window_hours=window_hours, lean=lean,
+                             include_comments=include_comments, deadline=deadline),
+            refresh,
+            deadline,
+        )
+    return _response(results, complete, deadline, spans, trace)
 
 @router.get("/twitter_niche_crawler")
-async def twitter_niche(niche: str = "cars"):
-    results = await run_twitter_niche_crawler(niche)
-    return results
\ No newline at end of file
+async def twitter_niche(niche: str = "cars", include_replies: bool = True, lean: Optional[bool] = None,
+                        deadline: Optional[float] = Query(None, gt=0), refresh: bool = False, trace: bool = False):
+    key = twitter_key(niche, include_replies)
+    with tracing() as spans:
+        results, complete = await _cached_crawl(
+            key,
+            lambda: dispatch(run_twitter_niche_crawler, niche, lean=lean, include_replies=include_replies, deadline=deadline),
+            refresh,
+            deadline,
+        )
+    return _response(results, complete, deadline, spans, trace)
+
+@router.get("/youtube_crawler/stream")
+async def crawl_stream(query: str, top_k: int = 5, window_hours: float = 48.0, include_comments: bool = True, lean: Optional[bool] = None,
+                       deadline: Optional[float] = Query(None, gt=0), refresh: bool = False, fmt: Literal["ndjson", "sse"] = Query("ndjson", alias="format")):
+    key = youtube_key(query, top_k, window_hours, include_comments)
+    cached = None if refresh else await result_cache.get_fresh(key)
+    if cached is not None:
+        return stream_response(cached_events(cached), fmt)
+    events = crawl_events(
+        lambda: dispatch(run_youtube_crawler, query, top_k=top_k, window_hours=window_hours, lean=lean,
+                         include_comments=include_comments, deadline=deadline),
+        on_complete=lambda results: result_cache.put(key, results),
+    )
+    return stream_response(events, fmt)
+
+@router.get("/twitter_niche_crawler/stream")
+async def twitter_niche_stream(niche: str = "cars", include_replies: bool = True, lean: Optional[bool] = None,
+                               deadline: Optional[float] = Query(None, gt=0), refresh: bool = False, fmt: Literal["ndjson", "sse"] = Query("ndjson", alias="format")):
+    key = twitter_key(niche, include_replies)
+    cached = None if refresh else await result_cache.get_fresh(key)
+    if cached is not None:
+        return stream_response(cached_events(cached), fmt)
+    events = crawl_events(
+        lambda: dispatch(run_twitter_niche_crawler, niche, lean=lean, include_replies=include_replies, deadline=deadline),
+        on_complete=lambda results: result_cache.put(key, results),
+    )
+    return stream_response(events, fmt)
+
+@router.post("/batch_crawler")
+async def batch_crawl(params: BatchCrawlParams):
+    results = await dispatch(run_batch_crawl, **params.model_dump())
+    # Each query's result is as good as a single crawl, so serve later single requests from it
+    for query, videos in results["youtube"].items():
+        if isinstance(videos, list):
+            await result_cache.put(youtube_key(query, params.top_k, params.window_hours, params.include_comments), videos)
+    for niche, tweets in results["twitter"].items():
+        if isinstance(tweets, list):
+            await result_cache.put(twitter_key(niche, params.include_replies), tweets)
+    return results
+
+@router.post("/enrich")
+async def enrich(params: EnrichParams):
+    # Top comments/replies for URLs from an earlier include_comments=false / include_replies=false crawl
+    return await dispatch(run_enrichment, params.urls, lean=params.lean)
+
+@router.get("/crawler_stats")
+async def crawler_stats():
+    return {
+        "browser_pool": browser_pool.stats(),
+        "page_scheduler": page_scheduler.stats(),
+        "lean_mode": lean_totals,
+        "result_cache": result_cache.stats(),
+        "jobs": job_manager.stats(),
+        "enrichment_store": enrichment_store.stats(),
+        "engagement_store": engagement_store.stats(),
+        "prewarm": prewarm_scheduler.stats(),
+        "workers": worker_pool.stats(),
+        "memory": memory_governor.stats(),
+    }
@@ -0,0 +1,13 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Query
+from app.core.engagement_store import engagement_store
+
+router = APIRouter(prefix="/engagement", tags=["engagement"])
+
+
+@router.get("/movers")
+async def movers(site: Literal["youtube", "twitter"] = "youtube", niche: Optional[str] = None,
+                 metric: Literal["views", "likes", "retweets", "replies"] = "views",
+                 window_hours: float = Query(24, gt=0), limit: int = Query(20, ge=1, le=500)):
+    # Fastest-rising items between their first and last snapshot in the window; reads the store only, no crawl
+    return await engagement_store.movers(site, metric=metric, window_hours=window_hours, niche=niche, limit=limit)
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, HTTPException
+from app.core.jobs import JobQueueFull, job_manager
+from app.core.workers import dispatched
+from app.schemas.crawl import BatchCrawlParams, EnrichParams, TwitterNicheParams, YoutubeCrawlParams
+from app.services.batch_service import run_batch_crawl
+from app.services.crawler_service import run_youtube_crawler
+from app.services.enrichment_service import run_enrichment
+from app.services.twitter_niche_service import run_twitter_niche_crawler
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+job_manager.register("youtube_crawler", dispatched(run_youtube_crawler))
+job_manager.register("twitter_niche_crawler", dispatched(run_twitter_niche_crawler))
+job_manager.register("batch_crawler", dispatched(run_batch_crawl))
+job_manager.register("enrich", dispatched(run_enrichment))
+
+
+def _submit(kind: str, params: dict):
+    try:
+        job = job_manager.submit(kind, params)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return job.as_dict()
+
+
+def _get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/youtube_crawler", status_code=202)
+async def submit_youtube_crawl(params: YoutubeCrawlParams):
+    return _submit("youtube_crawler", params.model_dump())
+
+@router.post("/twitter_niche_crawler", status_code=202)
+async def submit_twitter_niche_crawl(params: TwitterNicheParams):
+    return _submit("twitter_niche_crawler", params.model_dump())
+
+@router.post("/batch_crawler", status_code=202)
+async def submit_batch_crawl(params: BatchCrawlParams):
+    return _submit("batch_crawler", params.model_dump())
+
+@router.post("/enrich", status_code=202)
+async def submit_enrich(params: EnrichParams):
+    return _submit("enrich", params.model_dump())
+
+@router.get("/{job_id}")
+async def job_status(job_id: str):
+    return _get_job(job_id).as_dict()
+
+@router.get("/{job_id}/result")
+async def job_result(job_id: str):
+    job = _get_job(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job.result
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    return job_manager.cancel(_get_job(job_id).id).as_dict()
@@ -0,0 +1,54 @@
+import time
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException
+from app.core.cache import result_cache
+from app.core.config import PREWARM_YOUTUBE_QUERIES, PREWARM_TWITTER_NICHES
+from app.core.prewarm import prewarm_scheduler
+from app.core.workers import dispatch
+from app.routers.crawler import twitter_key, youtube_key
+from app.services.crawler_service import run_youtube_crawler
+from app.services.twitter_niche_service import run_twitter_niche_crawler
+
+router = APIRouter(prefix="/prewarm", tags=["prewarm"])
+
+
+def add_targets(scheduler, youtube_queries, twitter_niches):
+    # Keys and defaults of GET /youtube_crawler and /twitter_niche_crawler, so those serve the pre-warmed results
+    for query in youtube_queries:
+        scheduler.add(
+            "youtube_crawler", query,
+            youtube_key(query),
+            lambda query=query: dispatch(run_youtube_crawler, query),
+        )
+    for niche in twitter_niches:
+        scheduler.add(
+            "twitter_niche_crawler", niche,
+            twitter_key(niche),
+            lambda niche=niche: dispatch(run_twitter_niche_crawler, niche),
+        )
+
+
+add_targets(prewarm_scheduler, PREWARM_YOUTUBE_QUERIES, PREWARM_TWITTER_NICHES)
+
+
+async def _freshness(target):
+    status = target.as_dict()
+    entry = await result_cache.get(target.key)
+    status["cached_at"] = entry["stored_at"] if entry else None
+    status["expires_at"] = entry["expires_at"] if entry else None
+    status["fresh"] = entry is not None and time.time() < entry["expires_at"]
+    return status
+
+@router.get("")
+async def prewarm_status():
+    return {
+        "scheduler": prewarm_scheduler.stats(),
+        "targets": [await _freshness(target) for target in prewarm_scheduler.targets.values()],
+    }
+
+@router.post("/refresh", status_code=202)
+async def prewarm_refresh(kind: Optional[Literal["youtube_crawler", "twitter_niche_crawler"]] = None, name: Optional[str] = None):
+    triggered = prewarm_scheduler.trigger(kind, name)
+    if not triggered:
+        raise HTTPException(status_code=404, detail="No matching pre-warm target")
+    return {"triggered": [{"kind": target.kind, "name": target.name} for target in triggered]}
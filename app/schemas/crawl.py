@@ -0,0 +1,34 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.core.config import BATCH_CONCURRENCY
+
+
+class YoutubeCrawlParams(BaseModel):
+    query: str
+    top_k: int = 5
+    window_hours: float = 48.0
+    include_comments: bool = True
+    lean: Optional[bool] = None
+
+
+class TwitterNicheParams(BaseModel):
+    niche: str = "cars"
+    include_replies: bool = True
+    lean: Optional[bool] = None
+
+
+class BatchCrawlParams(BaseModel):
+    youtube_queries: List[str] = []
+    twitter_niches: List[str] = []
+    top_k: int = 5
+    window_hours: float = 48.0
+    include_comments: bool = True
+    include_replies: bool = True
+    lean: Optional[bool] = None
+    concurrency: int = Field(BATCH_CONCURRENCY, ge=1)
+
+
+class EnrichParams(BaseModel):
+    urls: List[str] = Field(..., min_length=1, max_length=100)
+    lean: Optional[bool] = None
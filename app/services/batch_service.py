@@ -0,0 +1,67 @@
+import asyncio
+
+from app.core.browser_pool import browser_pool
+from app.core.config import BATCH_CONCURRENCY
+from app.services.crawler_service import crawl_youtube
+from app.services.twitter_niche_service import AUTH_FILE, crawl_twitter_niche, ensure_twitter_auth
+
+
+def _unique(items):
+    return list(dict.fromkeys(item.strip() for item in items if item.strip()))
+
+
+async def _crawl_group(names, crawl, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def guarded(name):
+        async with semaphore:
+            return await crawl(name)
+
+    results = await asyncio.gather(*(guarded(name) for name in names), return_exceptions=True)
+    grouped = {}
+    for name, result in zip(names, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, Exception):
+            print(f"[ERROR] Batch crawl for '{name}' failed: {result}")
+            grouped[name] = {"error": str(result)}
+        else:
+            grouped[name] = result
+    return grouped
+
+
+async def _youtube_batch(queries, top_k: int, window_hours: float, include_comments: bool, lean: bool, concurrency: int):
+    if not queries:
+        return {}
+    # One context for every query: consent is accepted once and shared detail URLs are visited once
+    detail_memo = {}
+    async with browser_pool.lease() as context:
+        return await _crawl_group(
+            queries,
+            lambda query: crawl_youtube(context, query, top_k=top_k, window_hours=window_hours, lean=lean, detail_memo=detail_memo,
+                                        include_comments=include_comments),
+            concurrency,
+        )
+
+
+async def _twitter_batch(niches, include_replies: bool, lean: bool, concurrency: int):
+    if not niches:
+        return {}
+    await ensure_twitter_auth()
+    reply_memo = {}
+    async with browser_pool.lease(storage_state=AUTH_FILE) as context:
+        return await _crawl_group(
+            niches,
+            lambda niche: crawl_twitter_niche(context, niche, lean=lean, include_replies=include_replies, reply_memo=reply_memo),
+            concurrency,
+        )
+
+
+async def run_batch_crawl(youtube_queries=(), twitter_niches=(), top_k: int = 5, window_hours: float = 48,
+                          include_comments: bool = True, include_replies: bool = True, lean: bool = None,
+                          concurrency: int = BATCH_CONCURRENCY):
+    youtube, twitter = await asyncio.gather(
+        _youtube_batch(_unique(youtube_queries), top_k, window_hours, include_comments, lean, concurrency),
+        _twitter_batch(_unique(twitter_niches), include_replies, lean, concurrency),
+    )
+    return {"youtube": youtube, "twitter": twitter}
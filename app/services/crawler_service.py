@@ -1,8 +1,30 @@
 import asyncio
-from playwright.async_api import async_playwright
 import re
 from datetime import timedelta, datetime, timezone
 from dateutil.parser import parse as parse_date
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.core.browser_pool import browser_pool
+from app.core.capture import ResponseCapture
+from app.core.cache import make_key
+from app.core.config import (
+    CAPTURE_MODE, CRAWL_ENGINE, PIPELINE_MODE, WAIT_MAX_MS, YOUTUBE_BASE_URL, YOUTUBE_HTTP_FAST_PATH,
+)
+from app.core.deadline import current_deadline, deadline_scope, mark_incomplete, stage_expired, time_left, timeout_ms
+from app.core.engagement_store import engagement_store
+from app.core.enrichment_store import enrichment_store
+from app.core.extract import extract_texts, extract_watch_metadata, extract_youtube_listing
+from app.core.harvest import Harvester
+from app.core.lean import prepare_page, release_media
+from app.core.memory import MemoryLimitExceeded, memory_governor
+from app.core.metrics import items_skipped, retries, timed, timeouts
+from app.core.page_scheduler import page_scheduler
+from app.core.parsing import parse_views, upload_age, video_id
+from app.core.payloads import YOUTUBE_SEARCH_PATTERNS, youtube_has_more, youtube_videos
+from app.core.pipeline import Pipeline
+from app.core.progress import report
+from app.core.waits import count_elements, wait_for_any, wait_for_count_growth, wait_for_dom_settle, wait_for_new_elements
+from app.services.youtube_http import fetch_watch_metadata
 
 
 def _parse_date(date_str: str):
@@ -18,184 +40,544 @@ def _parse_date(date_str: str):
     except (ValueError, TypeError):
         return None
 
-async def run_youtube_crawler(query: str):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        YOUTUBE_URL = f"https://www.youtube.com/results?search_query={query}&sp=CAI%253D"
-        await page.goto(YOUTUBE_URL)
-        
-        try:
-            consent_button = await page.query_selector('button[aria-label="Agree to the use of cookies and other data for the purposes described"]')
-            if consent_button:
-                await consent_button.click()
-                await page.wait_for_timeout(2000)
-        except Exception:
-            pass
-
-        # Wait for initial results to load before scrolling
-        await page.wait_for_selector('ytd-video-renderer', timeout=10000)
-
-        # Scroll down until no more videos are loaded
-        last_height = await page.evaluate('document.body.scrollHeight')
-        for i in range(30):  # Increased to 30 scrolls
-            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            await page.wait_for_timeout(4000)  # Increased wait to 4 seconds
-            new_height = await page.evaluate('document.body.scrollHeight')
-            videos_found = len(await page.query_selector_all('ytd-video-renderer'))
-            print(f"[DEBUG] Scroll {i+1}: {videos_found} videos found.")
-            if new_height == last_height:
-                break
-            last_height = new_height
-
-        videos = await page.query_selector_all('ytd-video-renderer')
-
-        async def fetch_video_data(video):
-            title_el = await video.query_selector('#video-title')
-            if not title_el:
-                return None
-            
-            url = await title_el.get_attribute('href')
-            if not url or not (url.startswith('/watch') or url.startswith('/shorts')):
-                return None
-            
-            meta_items = await video.query_selector_all('span.inline-metadata-item')
-            if not meta_items or len(meta_items) < 1:
-                return None
-            
-            title = await title_el.inner_text()
-            views_text = await meta_items[0].inner_text()
+def _is_recent(parsed_date: str, window_hours: float):
+    video_datetime = datetime.strptime(parsed_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
+    return (now - video_datetime) <= timedelta(hours=window_hours)
+
+def _listing_candidate(item):
+    url = item["href"]
+    if not url or not (url.startswith('/watch') or url.startswith('/shorts')):
+        return None
 
+    meta_items = item["meta"]
+    if not meta_items or len(meta_items) < 1:
+        return None
+
+    return {
+        "title": item["title"],
+        "path": url,
+        "views": parse_views(meta_items[0]),
+        "uploaded": meta_items[1] if len(meta_items) > 1 else None,
+    }
+
+async def _extract_comments(video_page, url: str, metadata):
+    comments = []
+    comments_disabled = False
+    try:
+        if '/shorts/' in url:
+            # Shorts: Click the comments button and extract from panel
             try:
-                views = views_text.replace(' views', '').replace(',', '').strip()
-                if 'K' in views:
-                    views = int(float(views.replace('K', '')) * 1_000)
-                elif 'M' in views:
-                    views = int(float(views.replace('M', '')) * 1_000_000)
+                comments_button_selector = '#comments-button'
+                await video_page.wait_for_selector(comments_button_selector, timeout=5000)
+                comments_button = await video_page.query_selector(comments_button_selector)
+                if comments_button:
+                    await comments_button.click()
+                    await video_page.wait_for_selector('ytd-comment-thread-renderer', timeout=10000)
+                    comments = await extract_texts(video_page, 'ytd-comment-thread-renderer #content-text', 3)
                 else:
-                    views = int(views)
+                    comments_disabled = True
             except Exception:
-                views = 0
-            
-            is_short = '/shorts/' in url
-            video_page = await browser.new_page()
-            
+                comments_disabled = True
+        else:
+            # Regular video: Check for '0 comments' indicator before scrolling
+            zero_comments = False
+            # Look for a '0 Comments' label near the comments section
+            zero_text = metadata.get("comment_count")
+            if zero_text and '0 comments' in zero_text.lower():
+                zero_comments = True
+                comments_disabled = True
+            if not zero_comments:
+                # Scroll down in smaller increments until the first comments render
+                comment_selector = 'ytd-comment-thread-renderer #content-text'
+                comments_found = await count_elements(video_page, comment_selector)
+                for _ in range(5):
+                    if comments_found >= 3:
+                        break
+                    await video_page.evaluate('window.scrollBy(0, 800)')
+                    comments_found = await wait_for_count_growth(video_page, comment_selector, comments_found, timeout_ms=1500)
+                try:
+                    await video_page.wait_for_selector(comment_selector, timeout=15000)
+                    comments = await extract_texts(video_page, comment_selector, 3)
+                except Exception as e:
+                    if isinstance(e, PlaywrightTimeoutError):
+                        timeouts.inc(stage="comments")
+                    # Check for comments disabled message
+                    msg = (await extract_watch_metadata(video_page)).get("message")
+                    if msg and ('Comments are turned off' in msg or 'disabled' in msg):
+                        comments_disabled = True
+    except Exception as e:
+        print(f"[WARN] Could not extract comments for {url}: {e}")
+
+    return comments, comments_disabled
+
+def _date_qualifies(parsed_date, title: str, window_hours: float):
+    # Filter videos based on date
+    if not parsed_date:
+        print(f"[INFO] Skipping video (no date found): {title}")
+        items_skipped.inc(reason="no_date")
+        return False
+    try:
+        if not _is_recent(parsed_date, window_hours):
+            print(f"[INFO] Skipping video (older than {window_hours} hours): {title}")
+            items_skipped.inc(reason="outside_window")
+            return False
+    except Exception as e:
+        print(f"[WARN] Could not parse date for '{title}', skipping. Error: {e}")
+        items_skipped.inc(reason="bad_date")
+        return False
+    return True
+
+def _video_result(query: str, candidate, video_url: str, parsed_date: str, comments, comments_disabled: bool, views=None):
+    url = candidate["path"]
+    return {
+        "query": query,
+        "title": candidate["title"],
+        "url": video_url,
+        "views": views if views is not None else candidate["views"],
+        "is_short": '/shorts/' in url,
+        "date": parsed_date,
+        "comments": comments,
+        "comments_disabled": comments_disabled
+    }
+
+def _store_url(video_url: str):
+    # Enrichment-store key: every href a video is listed under ("&pp=..." tracking, /shorts/) and the
+    # /enrich form from classify_url share one row
+    vid = video_id(video_url)
+    return f"{YOUTUBE_BASE_URL}/watch?v={vid}" if vid else video_url
+
+async def _store_comments(video_url: str, comments, comments_disabled: bool):
+    # An empty list may just mean extraction failed, so only remember definite answers
+    if comments or comments_disabled:
+        await enrichment_store.put(_store_url(video_url), "youtube", comments=comments, comments_disabled=comments_disabled)
+
+async def fetch_comments(context, path: str, lean: bool = None):
+    video_url = f"{YOUTUBE_BASE_URL}{path}"
+    known = await enrichment_store.get(_store_url(video_url))
+    if "comments" in known:
+        return known["comments"], known["comments_disabled"]
+    comments = []
+    comments_disabled = False
+    try:
+        async with page_scheduler.page(context, video_url) as video_page:
             try:
-                await video_page.goto(f"https://www.youtube.com{url}", timeout=60000)
-                await video_page.wait_for_timeout(2000)
+                await prepare_page(video_page, "youtube", lean)
+                with timed("navigation", site="youtube"):
+                    await video_page.goto(video_url, timeout=60000)
+                await wait_for_any(video_page, ['ytd-comments', '#comments-button'])
+                with timed("comments", url=path):
+                    page_metadata = await extract_watch_metadata(video_page)
+                    comments, comments_disabled = await _extract_comments(video_page, path, page_metadata)
+            except Exception as e:
+                if isinstance(e, PlaywrightTimeoutError):
+                    timeouts.inc(stage="comments")
+                print(f"[WARN] Could not extract comments for {path}: {e}")
+    except MemoryLimitExceeded as e:
+        # Refused before the page opened: nothing was learned, so nothing is stored
+        print(f"[WARN] Skipping comments for {path}: {e}")
+        items_skipped.inc(reason="memory_limit")
+        return comments, comments_disabled
+    await _store_comments(video_url, comments, comments_disabled)
+    return comments, comments_disabled
 
-                video_date = None
-                try:
-                    date_el = await video_page.query_selector('div#info-strings yt-formatted-string')
-                    if date_el:
-                        video_date = await date_el.inner_text()
-                    if not video_date:
-                        shorts_date_el = await video_page.query_selector('span.ytd-video-primary-info-renderer')
-                        if shorts_date_el:
-                            video_date = await shorts_date_el.inner_text()
-                    if not video_date:
-                        meta_date = await video_page.query_selector('meta[itemprop="datePublished"]')
-                        if meta_date:
-                            video_date = await meta_date.get_attribute('content')
-                except Exception:
-                    pass
-
-                parsed_date = _parse_date(video_date)
-                
-                # Filter videos based on date
-                if not parsed_date:
-                    print(f"[INFO] Skipping video (no date found): {title}")
-                    return None
+async def _enrich_video_known(context, candidate, query: str, window_hours: float, known, lean: bool = None,
+                              include_comments: bool = True):
+    # Publish date (and maybe comments) already in the enrichment store
+    video_url = f"{YOUTUBE_BASE_URL}{candidate['path']}"
+    parsed_date = known["published"]
+    if not _date_qualifies(parsed_date, candidate["title"], window_hours):
+        return None
+    if not include_comments:
+        comments, comments_disabled = None, None
+    elif "comments" in known:
+        comments, comments_disabled = known["comments"], known["comments_disabled"]
+    else:
+        comments, comments_disabled = await fetch_comments(context, candidate["path"], lean)
+    return _video_result(query, candidate, video_url, parsed_date, comments, comments_disabled)
 
-                try:
-                    video_datetime = datetime.strptime(parsed_date, '%Y-%m-%d').replace(tzinfo=timezone.utc)
-                    now = datetime.now(timezone.utc)
-                    if (now - video_datetime) > timedelta(hours=48):
-                        print(f"[INFO] Skipping video (older than 48 hours): {title}")
-                        return None
-                except Exception as e:
-                    print(f"[WARN] Could not parse date for '{title}', skipping. Error: {e}")
+async def _enrich_video_http(context, candidate, query: str, window_hours: float, lean: bool = None,
+                             include_comments: bool = True):
+    # Date, views and comment count come from the raw watch HTML; the browser is only
+    # needed for comments, which YouTube loads through a continuation request.
+    url = candidate["path"]
+    metadata = await fetch_watch_metadata(url)
+    if not metadata:
+        return False, None
+
+    video_url = f"{YOUTUBE_BASE_URL}{url}"
+    parsed_date = _parse_date(metadata["date"])
+    if parsed_date:
+        await enrichment_store.put(_store_url(video_url), "youtube", published=parsed_date)
+    if not _date_qualifies(parsed_date, candidate["title"], window_hours):
+        return True, None
+
+    comments = []
+    comments_disabled = metadata["comments_disabled"]
+    if not include_comments:
+        comments, comments_disabled = None, None
+    elif comments_disabled:
+        await _store_comments(video_url, comments, comments_disabled)
+    else:
+        comments, comments_disabled = await fetch_comments(context, url, lean)
+    return True, _video_result(query, candidate, video_url, parsed_date, comments, comments_disabled, metadata["views"])
+
+async def _watch_page_date(video_page, video_url: str):
+    await wait_for_any(video_page, [
+        'div#info-strings yt-formatted-string',
+        'span.ytd-video-primary-info-renderer',
+        'meta[itemprop="datePublished"]',
+    ])
+
+    metadata = {}
+    try:
+        metadata = await extract_watch_metadata(video_page)
+    except Exception:
+        pass
+    video_date = metadata.get("info_date") or metadata.get("shorts_date") or metadata.get("meta_date")
+    # Everything else on the watch page is text; stop the player so its media buffers are freed right away
+    await release_media(video_page)
+
+    parsed_date = _parse_date(video_date)
+    if parsed_date:
+        await enrichment_store.put(_store_url(video_url), "youtube", published=parsed_date)
+    return metadata, parsed_date
+
+async def _enrich_video(context, candidate, query: str, window_hours: float, lean: bool = None, include_comments: bool = True):
+    known = await enrichment_store.get(_store_url(candidate["path"]))
+    if "published" in known:
+        return await _enrich_video_known(context, candidate, query, window_hours, known, lean, include_comments)
+
+    if YOUTUBE_HTTP_FAST_PATH:
+        handled, result = await _enrich_video_http(context, candidate, query, window_hours, lean, include_comments)
+        if handled:
+            return result
+        retries.inc(reason="http_fallback")
+
+    title = candidate["title"]
+    url = candidate["path"]
+    video_url = f"{YOUTUBE_BASE_URL}{url}"
+    try:
+        async with page_scheduler.page(context, video_url) as video_page:
+            try:
+                await prepare_page(video_page, "youtube", lean)
+                with timed("navigation", site="youtube"):
+                    await video_page.goto(video_url, timeout=60000)
+                metadata, parsed_date = await _watch_page_date(video_page, video_url)
+                if not _date_qualifies(parsed_date, title, window_hours):
                     return None
 
-                comments = []
-                comments_disabled = False
-                try:
-                    if '/shorts/' in url:
-                        # Shorts: Click the comments button and extract from panel
-                        try:
-                            comments_button_selector = '#comments-button'
-                            await video_page.wait_for_selector(comments_button_selector, timeout=5000)
-                            comments_button = await video_page.query_selector(comments_button_selector)
-                            if comments_button:
-                                await comments_button.click()
-                                await video_page.wait_for_selector('ytd-comment-thread-renderer', timeout=10000)
-                                comment_elements = await video_page.query_selector_all('ytd-comment-thread-renderer #content-text')
-                                for c in comment_elements[:3]:
-                                    comments.append(await c.inner_text())
-                            else:
-                                comments_disabled = True
-                        except Exception:
-                            comments_disabled = True
-                    else:
-                        # Regular video: Check for '0 comments' indicator before scrolling
-                        zero_comments = False
-                        try:
-                            # Look for a '0 Comments' label near the comments section
-                            zero_comments_el = await video_page.query_selector('h2#count, ytd-comments-header-renderer #count')
-                            if zero_comments_el:
-                                zero_text = await zero_comments_el.inner_text()
-                                if '0 comments' in zero_text.lower():
-                                    zero_comments = True
-                                    comments_disabled = True
-                        except Exception:
-                            pass
-                        if not zero_comments:
-                            # Scroll down in smaller increments to reliably load comments
-                            for _ in range(5):
-                                await video_page.evaluate('window.scrollBy(0, 800)')
-                                await video_page.wait_for_timeout(1500)
-                            try:
-                                await video_page.wait_for_selector('ytd-comment-thread-renderer #content-text', timeout=15000)
-                                comment_elements = await video_page.query_selector_all('ytd-comment-thread-renderer #content-text')
-                                for c in comment_elements[:3]:
-                                    text = await c.inner_text()
-                                    comments.append(text)
-                            except Exception:
-                                # Check for comments disabled message
-                                disabled_el = await video_page.query_selector('ytd-message-renderer, #message')
-                                if disabled_el:
-                                    msg = await disabled_el.inner_text()
-                                    if 'Comments are turned off' in msg or 'disabled' in msg:
-                                        comments_disabled = True
-                except Exception as e:
-                    print(f"[WARN] Could not extract comments for {url}: {e}")
-
-                return {
-                    "query": query,
-                    "title": title,
-                    "url": f"https://www.youtube.com{url}",
-                    "views": views,
-                    "is_short": is_short,
-                    "date": parsed_date,
-                    "comments": comments,
-                    "comments_disabled": comments_disabled
-                }
+                if not include_comments:
+                    return _video_result(query, candidate, video_url, parsed_date, None, None)
+
+                with timed("comments", url=url):
+                    comments, comments_disabled = await _extract_comments(video_page, url, metadata)
+                await _store_comments(video_url, comments, comments_disabled)
+
+                return _video_result(query, candidate, video_url, parsed_date, comments, comments_disabled)
 
             except Exception as e:
+                if isinstance(e, PlaywrightTimeoutError):
+                    timeouts.inc(stage="detail_fetch")
                 print(f"[ERROR] Failed to process video {url}: {e}")
                 return None # Return None if any part of page navigation/scraping fails
-            finally:
-                await video_page.close()
+    except MemoryLimitExceeded as e:
+        print(f"[WARN] Skipping video {url}: {e}")
+        items_skipped.inc(reason="memory_limit")
+        return None
+
+def _listing_harvester(window_hours: float, discovered=None):
+    # Results are sorted by upload date, so scrolling can stop once uploads fall outside the window
+    def outside_window(candidate):
+        age = upload_age(candidate["uploaded"])
+        return age is not None and age > timedelta(hours=window_hours)
+    return Harvester(lambda candidate: video_id(candidate["path"]), outside_window=outside_window, discovered=discovered)
+
+async def _scrape_listing(page, harvest: Harvester):
+    # Wait for initial results to load before scrolling
+    await page.wait_for_selector('ytd-video-renderer', timeout=timeout_ms("listing", 10000))
+
+    listed = 0
+    with timed("scroll", site="youtube"):
+        for i in range(31):
+            # Only the renderers mounted since the last step are read
+            with timed("listing_extraction", site="youtube"):
+                videos = await extract_youtube_listing(page, fresh=True)
+                listed += len(videos)
+                candidates = []
+                for video in videos:
+                    candidate = _listing_candidate(video)
+                    if not candidate:
+                        items_skipped.inc(reason="not_a_video")
+                        continue
+                    candidates.append(candidate)
+                harvest.add(candidates)
+            await harvest.hand_off()
+            if i:
+                print(f"[DEBUG] Scroll {i}: {len(harvest.items)} videos found.")
+                report("scroll", scrolls=i, videos=len(harvest.items))
+            if harvest.done or i == 30 or stage_expired("scroll"):
+                break
+            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+            if not await wait_for_new_elements(page, 'ytd-video-renderer', timeout_ms=timeout_ms("scroll", WAIT_MAX_MS)):
+                break
+    return listed
+
+async def _capture_listing(page, harvest: Harvester):
+    # The first results are embedded as ytInitialData; scrolling fetches the rest from /youtubei/v1/search
+    capture = ResponseCapture(page, YOUTUBE_SEARCH_PATTERNS)
+    try:
+        initial = await page.evaluate("() => window.ytInitialData || null")
+        if not initial:
+            print("[WARN] No ytInitialData on the search page")
+            return 0
+        with timed("scroll", site="youtube"):
+            listed = len(harvest.add(youtube_videos(initial)))
+            await harvest.hand_off()
+            more = youtube_has_more(initial)
+            scrolls = 0
+            while more and not harvest.done and scrolls < 30 and not stage_expired("scroll"):
+                received = len(capture.payloads)
+                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+                if await capture.wait_for_growth(received, timeout_ms("scroll", WAIT_MAX_MS)) == received:
+                    break
+                scrolls += 1
+                for payload in capture.payloads[received:]:
+                    videos = youtube_videos(payload)
+                    listed += len(videos)
+                    harvest.add(videos)
+                await harvest.hand_off()
+                more = youtube_has_more(capture.payloads[-1])
+                report("scroll", scrolls=scrolls, videos=len(harvest.items))
+    finally:
+        capture.close()
+    return listed
+
+async def _accept_consent(page):
+    try:
+        consent_button = await page.query_selector('button[aria-label="Agree to the use of cookies and other data for the purposes described"]')
+        if consent_button:
+            await consent_button.click()
+            await wait_for_dom_settle(page)
+    except Exception:
+        pass
+
+def _window_candidates(items, window_hours: float):
+    # Drop results whose listing upload text is already outside the window, most viewed first
+    candidates = []
+    for candidate in items:
+        age = upload_age(candidate["uploaded"])
+        if age is not None and age > timedelta(hours=window_hours):
+            items_skipped.inc(reason="outside_window_listing")
+            continue
+        candidates.append(candidate)
+    candidates.sort(key=lambda c: c["views"], reverse=True)
+    return candidates
+
+async def _record_engagement(query: str, candidates):
+    await engagement_store.record("youtube", query, [
+        {"id": video_id(c["path"]), "views": c["views"], "title": c["title"], "url": f"{YOUTUBE_BASE_URL}{c['path']}"}
+        for c in candidates
+    ])
+
+def _search_url(query: str):
+    return f"{YOUTUBE_BASE_URL}/results?search_query={query}&sp=CAI%253D"
+
+async def _load_listing(context, query: str, harvest: Harvester, lean: bool = None, capture: bool = False):
+    listed = 0
+    await memory_governor.admit()
+    page = await context.new_page()
+    try:
+        await prepare_page(page, "youtube", lean)
+        with timed("navigation", site="youtube"):
+            await page.goto(_search_url(query), timeout=timeout_ms("listing", 30000))
+
+        await _accept_consent(page)
+
+        if capture:
+            listed = await _capture_listing(page, harvest)
+        else:
+            listed = await _scrape_listing(page, harvest)
+    except PlaywrightTimeoutError:
+        # Out of time before the listing loaded: an empty, incomplete result instead of an error
+        if current_deadline() is None:
+            raise
+        timeouts.inc(stage="listing")
+        mark_incomplete("listing")
+    finally:
+        await page.close()
+    return listed
+
+async def crawl_youtube(context, query: str, top_k: int = 5, window_hours: float = 48, lean: bool = None, detail_memo=None,
+                        capture: bool = None, include_comments: bool = True, pipeline: bool = None):
+    capture = CAPTURE_MODE if capture is None else capture
+    pipeline = PIPELINE_MODE if pipeline is None else pipeline
+
+    async def enrich(candidate):
+        if detail_memo is None:
+            with timed("detail_fetch", url=candidate["path"]):
+                result = await _enrich_video(context, candidate, query, window_hours, lean, include_comments)
+        else:
+            # Batch crawls share one detail visit per video across all their queries; keyed by id because
+            # search hrefs carry a per-query tracking parameter (&pp=...)
+            memo_key = video_id(candidate["path"]) or candidate["path"]
+            if memo_key not in detail_memo:
+                detail_memo[memo_key] = asyncio.ensure_future(
+                    _enrich_video(context, candidate, query, window_hours, lean, include_comments)
+                )
+            with timed("detail_fetch", url=candidate["path"]):
+                result = await detail_memo[memo_key]
+            if result is not None:
+                result = {**result, "query": query}
+        if result is not None:
+            report("item", item=result)
+        return result
+
+    videos_data = []
+    enricher = None
+    if pipeline:
+        # Detail pages open as soon as a scroll step finds in-window candidates, most viewed of the queued ones
+        # first. A candidate is only visited while fewer than top_k qualified videos out-view it, so the result
+        # is the same top_k as visiting in view order after the full listing.
+        qualified_views = []
+        visits = 0
+
+        async def consume(candidate):
+            nonlocal visits
+            if sum(1 for views in qualified_views if views >= candidate["views"]) >= top_k:
+                items_skipped.inc(reason="ranked_out")
+                return
+            visits += 1
+            result = await enrich(candidate)
+            if result is not None:
+                qualified_views.append(candidate["views"])
+                videos_data.append(result)
+            report("enrich", visited=visits, candidates=enricher.queued, qualified=len(videos_data))
+
+        async def discovered(items):
+            for candidate in _window_candidates(items, window_hours):
+                await enricher.put(candidate)
+
+        enricher = Pipeline(consume, priority=lambda candidate: -candidate["views"])
+        harvest = _listing_harvester(window_hours, discovered=discovered)
+    else:
+        harvest = _listing_harvester(window_hours)
 
-        tasks = [fetch_video_data(video) for video in videos]
-        results = await asyncio.gather(*tasks)
-        
-        videos_data = [res for res in results if res is not None]
+    try:
+        listed = await _load_listing(context, query, harvest, lean, capture)
+    except BaseException:
+        if enricher is not None:
+            await enricher.cancel()
+        raise
+    await _record_engagement(query, harvest.items)
+
+    if enricher is not None:
+        report("listing", listed=listed, candidates=enricher.queued)
+        if not await enricher.close(timeout=time_left("enrich")):
+            mark_incomplete("enrich")
+        visited, candidate_count = visits, enricher.queued
+    else:
+        candidates = _window_candidates(harvest.items, window_hours)
+        candidate_count = len(candidates)
 
-        await browser.close()
+        # Visit detail pages in view order and stop as soon as top_k videos qualify
+        report("listing", listed=listed, candidates=len(candidates))
+        visited = 0
+        while len(videos_data) < top_k and visited < len(candidates):
+            if stage_expired("enrich"):
+                break
+            batch = candidates[visited:visited + top_k - len(videos_data)]
+            visited += len(batch)
+            tasks = [asyncio.ensure_future(enrich(c)) for c in batch]
+            done, pending = await asyncio.wait(tasks, timeout=time_left("enrich"))
+            if pending:
+                # Out of time: close the remaining detail pages and rank what qualified so far
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                mark_incomplete("enrich")
+            results = [task.result() for task in tasks if task in done]
+            videos_data.extend(res for res in results if res is not None)
+            report("enrich", visited=visited, candidates=len(candidates), qualified=len(videos_data))
+    print(f"[INFO] Enriched {visited} of {candidate_count} candidates ({listed} listed) for '{query}'")
 
-    top_videos = sorted(videos_data, key=lambda x: x['views'], reverse=True)[:5]
+    with timed("ranking"):
+        top_videos = sorted(videos_data, key=lambda x: x['views'], reverse=True)[:top_k]
     return top_videos
 
+async def crawl_youtube_frontier(query: str, top_k: int = 5, window_hours: float = 48, lean: bool = None,
+                                 capture: bool = None, include_comments: bool = True):
+    # Imported here so crawlee is only needed when CRAWL_ENGINE=crawlee
+    from app.core.frontier import DETAIL, LISTING, Frontier, detail_request
+
+    capture = CAPTURE_MODE if capture is None else capture
+    key = make_key("youtube", query=query, top_k=top_k, window_hours=window_hours, include_comments=include_comments)
+    async with Frontier("youtube", key) as frontier:
+        crawler = frontier.crawler(lean)
+        backlog_lock = asyncio.Lock()
+
+        async def enqueue_next(context):
+            # A detail page that did not qualify is replaced by the next most viewed candidate
+            async with backlog_lock:
+                backlog = await frontier.state.get_value("backlog", [])
+                if not backlog:
+                    return
+                await frontier.state.set_value("backlog", backlog[1:])
+            candidate = backlog[0]
+            await context.add_requests([detail_request(f"{YOUTUBE_BASE_URL}{candidate['path']}", candidate=candidate)])
+
+        @crawler.router.handler(LISTING)
+        async def listing(context):
+            page = context.page
+            await _accept_consent(page)
+            harvest = _listing_harvester(window_hours)
+            listed = await (_capture_listing if capture else _scrape_listing)(page, harvest)
+            await _record_engagement(query, harvest.items)
+            candidates = _window_candidates(harvest.items, window_hours)
+            report("listing", listed=listed, candidates=len(candidates))
+            # Only top_k detail pages are queued up front; the rest wait in the state store as replacements
+            await frontier.state.set_value("backlog", candidates[top_k:])
+            await context.add_requests([
+                detail_request(f"{YOUTUBE_BASE_URL}{candidate['path']}", candidate=candidate) for candidate in candidates[:top_k]
+            ])
+
+        @crawler.router.handler(DETAIL)
+        async def detail(context):
+            candidate = context.request.user_data["candidate"]
+            video_page = context.page
+            video_url = context.request.url
+            metadata, parsed_date = await _watch_page_date(video_page, video_url)
+            if not _date_qualifies(parsed_date, candidate["title"], window_hours):
+                await enqueue_next(context)
+                return
+            comments, comments_disabled = None, None
+            if include_comments:
+                with timed("comments", url=candidate["path"]):
+                    comments, comments_disabled = await _extract_comments(video_page, candidate["path"], metadata)
+                await _store_comments(video_url, comments, comments_disabled)
+            result = _video_result(query, candidate, video_url, parsed_date, comments, comments_disabled)
+            await frontier.dataset.push_data(result)
+            report("item", item=result)
+
+        @crawler.failed_request_handler
+        async def failed(context, error):
+            print(f"[ERROR] Failed to process {context.request.url}: {error}")
+            if context.request.label == DETAIL:
+                await enqueue_next(context)
+
+        videos_data = await frontier.run(crawler, _search_url(query))
+        # The storages are kept when the run raises, so calling again with the same parameters resumes it
+        await frontier.drop()
 
+    with timed("ranking"):
+        return sorted(videos_data, key=lambda x: x['views'], reverse=True)[:top_k]
 
+async def run_youtube_crawler(query: str, top_k: int = 5, window_hours: float = 48, lean: bool = None, capture: bool = None,
+                              include_comments: bool = True, deadline: float = None):
+    with deadline_scope(deadline):
+        if CRAWL_ENGINE == "crawlee":
+            return await crawl_youtube_frontier(query, top_k=top_k, window_hours=window_hours, lean=lean, capture=capture,
+                                                include_comments=include_comments)
+        async with browser_pool.lease() as context:
+            return await crawl_youtube(context, query, top_k=top_k, window_hours=window_hours, lean=lean, capture=capture,
+                                       include_comments=include_comments)
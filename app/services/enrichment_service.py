@@ -0,0 +1,75 @@
+import asyncio
+from urllib.parse import urlsplit
+
+from app.core.browser_pool import browser_pool
+from app.core.config import YOUTUBE_BASE_URL
+from app.core.parsing import status_id, video_id
+from app.services.crawler_service import fetch_comments
+from app.services.twitter_niche_service import AUTH_FILE, ensure_twitter_auth, fetch_top_replies
+
+_YOUTUBE_HOSTS = ("youtube.com", "youtu.be")
+_TWITTER_HOSTS = ("twitter.com", "x.com")
+
+
+def _host_matches(host: str, hosts):
+    return any(host == name or host.endswith("." + name) for name in hosts)
+
+
+def classify_url(url: str):
+    # -> ("youtube", "/watch?v=<id>" or "/shorts/<id>"), ("twitter", canonical status URL) or (None, None)
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if _host_matches(host, _YOUTUBE_HOSTS) or url.startswith(YOUTUBE_BASE_URL):
+        if host == "youtu.be":
+            vid = parts.path.strip("/") or None
+        else:
+            vid = video_id(f"{parts.path}?{parts.query}")
+        if vid:
+            return "youtube", f"/shorts/{vid}" if parts.path.startswith("/shorts/") else f"/watch?v={vid}"
+    if _host_matches(host, _TWITTER_HOSTS):
+        tweet_id = status_id(parts.path)
+        user = parts.path.strip("/").split("/")[0]
+        if tweet_id and user:
+            # Same form as the crawler's tweet URLs, so the enrichment store is shared
+            return "twitter", f"https://twitter.com/{user}/status/{tweet_id}"
+    return None, None
+
+
+async def _youtube_comments(paths, lean: bool):
+    if not paths:
+        return {}
+    async with browser_pool.lease() as context:
+        # page_scheduler bounds how many watch pages are open at once
+        results = await asyncio.gather(*(fetch_comments(context, path, lean) for path in paths))
+    return {
+        path: {"kind": "youtube", "url": f"{YOUTUBE_BASE_URL}{path}", "comments": comments, "comments_disabled": disabled}
+        for path, (comments, disabled) in zip(paths, results)
+    }
+
+
+async def _twitter_replies(urls, lean: bool):
+    if not urls:
+        return {}
+    await ensure_twitter_auth()
+    memo = {}
+    async with browser_pool.lease(storage_state=AUTH_FILE) as context:
+        await fetch_top_replies(context, [{"url": url} for url in urls], lean, memo=memo)
+    return {url: {"kind": "twitter", "url": url, "replies": await memo[url]} for url in urls}
+
+
+async def run_enrichment(urls, lean: bool = None):
+    """Top comments for YouTube videos and top replies for tweets, keyed by the requested URL."""
+    targets = {url: classify_url(url) for url in dict.fromkeys(urls)}
+    youtube_paths = list(dict.fromkeys(target for kind, target in targets.values() if kind == "youtube"))
+    tweet_urls = list(dict.fromkeys(target for kind, target in targets.values() if kind == "twitter"))
+
+    youtube, twitter = await asyncio.gather(_youtube_comments(youtube_paths, lean), _twitter_replies(tweet_urls, lean))
+    results = {}
+    for url, (kind, target) in targets.items():
+        if kind == "youtube":
+            results[url] = youtube[target]
+        elif kind == "twitter":
+            results[url] = twitter[target]
+        else:
+            results[url] = {"error": "Not a YouTube video or tweet URL"}
+    return results
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 import random
@@ -5,7 +6,28 @@ from playwright.sync_api import sync_playwright
 from dotenv import load_dotenv
 import datetime
 import string
+from contextlib import asynccontextmanager
 from fastapi.concurrency import run_in_threadpool
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.core.browser_pool import browser_pool
+from app.core.cache import make_key
+from app.core.capture import ResponseCapture
+from app.core.config import CAPTURE_MODE, CRAWL_ENGINE, PIPELINE_MODE, TWITTER_REPLY_CONCURRENCY
+from app.core.deadline import current_deadline, deadline_scope, mark_incomplete, stage_expired, time_left, timeout_ms
+from app.core.engagement_store import engagement_store
+from app.core.enrichment_store import enrichment_store
+from app.core.extract import extract_texts, extract_tweets
+from app.core.harvest import Harvester
+from app.core.lean import prepare_page
+from app.core.memory import MemoryLimitExceeded, memory_governor
+from app.core.metrics import items_skipped, timed, timeouts
+from app.core.page_scheduler import page_scheduler
+from app.core.parsing import status_id
+from app.core.payloads import TWITTER_DETAIL_PATTERNS, TWITTER_SEARCH_PATTERNS, twitter_replies, twitter_tweets
+from app.core.pipeline import Pipeline
+from app.core.progress import report
+from app.core.waits import wait_for_new_elements
 
 load_dotenv('p.env')
 TWITTER_USER = os.getenv('TWITTER_USER')
@@ -46,91 +68,383 @@ def save_twitter_auth():
         context.storage_state(path=AUTH_FILE)
         browser.close()
 
-def scrape_twitter_niche(niche="cars"):
+def _parse_tweet(article):
+    text = clean_text(article["text"])
+    engagement = {"replies": 0, "retweets": 0, "likes": 0, "views": 0}
+    for label, key in [("Reply", "replies"), ("Retweet", "retweets"), ("Repost", "retweets"), ("Like", "likes"), ("View", "views")]:
+        try:
+            label_text = article["engagement"].get(label)
+            if label_text is not None:
+                engagement[key] = parse_abbreviated_number(label_text)
+        except Exception:
+            pass
+    if engagement["retweets"] == 0:
+        try:
+            if article["retweet"] is not None:
+                engagement["retweets"] = parse_abbreviated_number(article["retweet"])
+        except Exception:
+            pass
+    dt_str = article["datetime"]
+    tweet_url = article["href"]
+    return {
+        "text": text,
+        "date": dt_str[:10] if dt_str else None,
+        "url": f"https://twitter.com{tweet_url}" if tweet_url else None,
+        "replies": engagement["replies"],
+        "retweets": engagement["retweets"],
+        "likes": engagement["likes"],
+        "views": engagement["views"],
+        "top_replies": ""
+    }
+
+async def _thread_reply_texts(thread_page):
+    await thread_page.wait_for_selector('article', timeout=timeout_ms("enrich", 15000))
+    reply_texts = await extract_texts(thread_page, 'article', 4)
+    # skip the first (main tweet), get up to 3 replies
+    return [clean_text(reply) for reply in reply_texts[1:4]]
+
+async def _thread_replies(thread_page, tweet_url: str):
+    await thread_page.goto(tweet_url, timeout=timeout_ms("enrich", 30000))
+    return await _thread_reply_texts(thread_page)
+
+async def _captured_thread_replies(thread_page, capture: ResponseCapture, tweet_url: str):
+    tweet_id = status_id(tweet_url)
+    received = len(capture.payloads)
+    await thread_page.goto(tweet_url, timeout=timeout_ms("enrich", 30000))
+    if await capture.wait_for_growth(received, timeout_ms=timeout_ms("enrich", 15000)) == received:
+        raise PlaywrightTimeoutError(f"No TweetDetail response for {tweet_url}")
+    replies = twitter_replies(capture.payloads[-1], tweet_id)
+    return [clean_text(reply["text"]) for reply in replies]
+
+@asynccontextmanager
+async def _thread_page(context, lean: bool = None, capture: bool = False):
+    # -> (page, TweetDetail capture or None), reused for many thread URLs
+    async with page_scheduler.page(context, "https://twitter.com") as thread_page:
+        await prepare_page(thread_page, "twitter", lean)
+        yield thread_page, ResponseCapture(thread_page, TWITTER_DETAIL_PATTERNS) if capture else None
+
+async def _load_replies(thread, url: str):
+    thread_page, detail = thread
+    replies = []
+    try:
+        with timed("replies", url=url):
+            if detail is not None:
+                replies = await _captured_thread_replies(thread_page, detail, url)
+            else:
+                replies = await _thread_replies(thread_page, url)
+        if replies:
+            await enrichment_store.put(url, "twitter", replies=replies)
+    except Exception as e:
+        if isinstance(e, PlaywrightTimeoutError):
+            timeouts.inc(stage="replies")
+        print(f"[WARN] Could not fetch replies for {url}: {e}")
+    return replies
+
+async def fetch_top_replies(context, tweets, lean: bool = None, concurrency: int = TWITTER_REPLY_CONCURRENCY, memo=None,
+                            capture: bool = None):
+    # A few long-lived pages work through the thread URLs instead of one new page per tweet.
+    # memo maps status URL -> future of its replies, so batch crawls load each thread once.
+    memo = {} if memo is None else memo
+    capture = CAPTURE_MODE if capture is None else capture
+    queue = asyncio.Queue()
+    queued = []
+    for tweet in tweets:
+        url = tweet["url"]
+        if not url or url in memo:
+            continue
+        memo[url] = asyncio.get_running_loop().create_future()
+        known = await enrichment_store.get(url)
+        if "replies" in known:
+            memo[url].set_result(known["replies"])
+        else:
+            queue.put_nowait(url)
+            queued.append(url)
+
+    async def worker():
+        try:
+            async with _thread_page(context, lean, capture) as thread:
+                while not queue.empty():
+                    url = queue.get_nowait()
+                    replies = []
+                    try:
+                        replies = await _load_replies(thread, url)
+                    finally:
+                        if not memo[url].done():
+                            memo[url].set_result(replies)
+        except MemoryLimitExceeded as e:
+            # No thread page for this worker; the others drain the queue and whatever is left gets no replies
+            print(f"[WARN] Reply worker not started: {e}")
+            items_skipped.inc(reason="memory_limit")
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(min(concurrency, queue.qsize()))]
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=time_left("enrich"))
+        if pending:
+            # Out of time: close the thread pages; tweets not reached keep empty replies
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            mark_incomplete("enrich")
+        for task in done:
+            task.result()
+    for url in queued:
+        if not memo[url].done():
+            memo[url].set_result([])
+    for tweet in tweets:
+        if tweet["url"]:
+            tweet["top_replies"] = " || ".join(await memo[tweet["url"]])
+    return tweets
+
+async def ensure_twitter_auth():
     if not os.path.exists(AUTH_FILE):
-        save_twitter_auth()
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(storage_state=AUTH_FILE)
-        page = context.new_page()
-        until_date = datetime.datetime.utcnow().date()
-        since_date = until_date - datetime.timedelta(days=2)
-        query = f'{niche} min_replies:5 min_faves:10 min_retweets:2 until:{until_date} since:{since_date}'
-        # query = f'{niche} until:{until_date} since:{since_date}'
-        url = f'https://twitter.com/search?q={query.replace(" ", "%20")}&src=typed_query&f=live'
-        page.goto(url)
-        page.wait_for_selector('article', timeout=15000)
-        last_count = 0
-        for _ in range(50):
-            articles = page.query_selector_all('article')
-            if len(articles) == last_count:
+        await run_in_threadpool(save_twitter_auth)
+
+def _search_harvester(since_date, discovered=None):
+    # Live search is newest first, so scrolling can stop once tweets predate the search window
+    since = since_date.isoformat()
+    return Harvester(
+        lambda tweet: tweet.get("id") or status_id(tweet["url"]),
+        outside_window=lambda tweet: bool(tweet["date"]) and tweet["date"] < since,
+        discovered=discovered,
+    )
+
+def _search_url(niche: str):
+    # -> (live search URL for the last two days, first day of the window)
+    until_date = datetime.datetime.utcnow().date()
+    since_date = until_date - datetime.timedelta(days=2)
+    query = f'{niche} min_replies:5 min_faves:10 min_retweets:2 until:{until_date} since:{since_date}'
+    # query = f'{niche} until:{until_date} since:{since_date}'
+    return f'https://twitter.com/search?q={query.replace(" ", "%20")}&src=typed_query&f=live', since_date
+
+async def _record_engagement(niche: str, tweets):
+    await engagement_store.record("twitter", niche, [
+        {**tweet, "id": tweet.get("id") or status_id(tweet["url"]), "title": (tweet.get("text") or "")[:200]} for tweet in tweets
+    ])
+
+def _rank_tweets(tweets):
+    tweets.sort(key=lambda t: (
+        t.get("views", 0),
+        t.get("likes", 0),
+        t.get("retweets", 0),
+        t.get("replies", 0)
+    ), reverse=True)
+    return tweets
+
+def _add_tweets(harvest: Harvester, tweets):
+    # Tweets are complete once listed (replies are added later), so stream them at the scroll step that found them
+    for tweet in harvest.add(tweets):
+        report("item", item=tweet)
+
+async def _scrape_search(page, url: str, harvest: Harvester):
+    with timed("navigation", site="twitter"):
+        await page.goto(url, timeout=timeout_ms("listing", 30000))
+    return await _harvest_search(page, harvest)
+
+async def _harvest_search(page, harvest: Harvester):
+    await page.wait_for_selector('article', timeout=timeout_ms("listing", 15000))
+    with timed("scroll", site="twitter"):
+        for i in range(51):
+            # The timeline is virtualized: read each batch of articles as soon as it mounts,
+            # before scrolling unmounts it again
+            with timed("listing_extraction", site="twitter"):
+                articles = await extract_tweets(page, fresh=True)
+                _add_tweets(harvest, [_parse_tweet(article) for article in articles])
+            await harvest.hand_off()
+            if i:
+                report("scroll", tweets=len(harvest.items))
+            if harvest.done or i == 50 or stage_expired("scroll"):
                 break
-            last_count = len(articles)
-            page.mouse.wheel(0, 2000)
-            page.wait_for_timeout(random.randint(1200, 2200))
-        articles = page.query_selector_all('article')
-        tweets_data = []
-        for article in articles:
-            text = clean_text(article.inner_text())
-            engagement = {"replies": 0, "retweets": 0, "likes": 0, "views": 0}
-            for label, key in [("Reply", "replies"), ("Retweet", "retweets"), ("Repost", "retweets"), ("Like", "likes"), ("View", "views")]:
-                try:
-                    el = article.query_selector(f'[aria-label*="{label}"]')
-                    if el:
-                        count = parse_abbreviated_number(el.inner_text())
-                        engagement[key] = count
-                except Exception:
-                    pass
-            if engagement["retweets"] == 0:
-                try:
-                    el = article.query_selector('[data-testid="retweet"]')
-                    if el:
-                        count = parse_abbreviated_number(el.inner_text())
-                        engagement["retweets"] = count
-                except Exception:
-                    pass
-            tweet_date = None
-            try:
-                time_tag = article.query_selector('time')
-                if time_tag:
-                    dt_str = time_tag.get_attribute('datetime')
-                    if dt_str:
-                        tweet_date = dt_str[:10]
-            except Exception:
-                pass
-            tweet_url = None
-            link = article.query_selector('a[href*="/status/"]')
-            if link:
-                tweet_url = link.get_attribute('href')
+            await page.mouse.wheel(0, 2000)
+            if not await wait_for_new_elements(page, 'article', timeout_ms=timeout_ms("scroll", random.randint(1200, 2200))):
+                break
+    return harvest.items
+
+def _timeline_tweets(payloads):
+    with timed("listing_extraction", site="twitter"):
+        return [
+            {**tweet, "text": clean_text(tweet["text"]), "top_replies": ""}
+            for payload in payloads
+            for tweet in twitter_tweets(payload)
+        ]
+
+async def _capture_search(page, url: str, harvest: Harvester):
+    # Every page of the search timeline arrives as a GraphQL SearchTimeline response
+    capture = ResponseCapture(page, TWITTER_SEARCH_PATTERNS)
+    try:
+        with timed("navigation", site="twitter"):
+            await page.goto(url, timeout=timeout_ms("listing", 30000))
+        received = await capture.wait_for_growth(0, timeout_ms=timeout_ms("listing", 15000))
+        if not received:
+            raise PlaywrightTimeoutError("No SearchTimeline response in time")
+        with timed("scroll", site="twitter"):
+            tweets = _timeline_tweets(capture.payloads[:received])
+            _add_tweets(harvest, tweets)
+            await harvest.hand_off()
+            for _ in range(50):
+                if not tweets or harvest.done or stage_expired("scroll"):
+                    break  # end of the timeline, nothing more needed or out of time
+                await page.mouse.wheel(0, 2000)
+                count = await capture.wait_for_growth(received, timeout_ms=timeout_ms("scroll", random.randint(1200, 2200)))
+                if count == received:
+                    break
+                tweets = _timeline_tweets(capture.payloads[received:count])
+                _add_tweets(harvest, tweets)
+                await harvest.hand_off()
+                received = count
+                report("scroll", tweets=len(harvest.items))
+    finally:
+        capture.close()
+    return harvest.items
+
+async def _load_search(context, url: str, harvest: Harvester, lean: bool = None, capture: bool = False):
+    tweets_data = []
+    await memory_governor.admit()
+    page = await context.new_page()
+    try:
+        await prepare_page(page, "twitter", lean)
+        if capture:
+            tweets_data = await _capture_search(page, url, harvest)
+        else:
+            tweets_data = await _scrape_search(page, url, harvest)
+    except PlaywrightTimeoutError:
+        # Out of time before the timeline loaded: an empty, incomplete result instead of an error
+        if current_deadline() is None:
+            raise
+        timeouts.inc(stage="listing")
+        mark_incomplete("listing")
+    finally:
+        await page.close()
+    return tweets_data
+
+async def crawl_twitter_niche(context, niche="cars", lean: bool = None, include_replies: bool = True, top_k: int = 5, reply_memo=None,
+                              capture: bool = None, pipeline: bool = None):
+    capture = CAPTURE_MODE if capture is None else capture
+    pipeline = PIPELINE_MODE if pipeline is None else pipeline
+    memo = {} if reply_memo is None else reply_memo
+    url, since_date = _search_url(niche)
+
+    replier = None
+    speculative = []
+    if pipeline and include_replies:
+        # Replies are fetched while scrolling for whichever tweets rank in the top_k so far; a tweet
+        # pushed out of it later costs one thread page (its replies still land in the enrichment store)
+        async def discovered(_):
+            for tweet in _rank_tweets(list(harvest.items))[:top_k]:
+                tweet_url = tweet["url"]
+                if not tweet_url or tweet_url in memo:
+                    continue
+                memo[tweet_url] = asyncio.get_running_loop().create_future()
+                known = await enrichment_store.get(tweet_url)
+                if "replies" in known:
+                    memo[tweet_url].set_result(known["replies"])
+                else:
+                    speculative.append(tweet_url)
+                    await replier.put(tweet_url)
+
+        async def consume(thread, tweet_url):
             replies = []
-            if tweet_url:
-                thread_page = context.new_page()
-                try:
-                    thread_page.goto(f"https://twitter.com{tweet_url}")
-                    thread_page.wait_for_selector('article', timeout=15000)
-                    reply_articles = thread_page.query_selector_all('article')
-                    for reply_article in reply_articles[1:4]:
-                        replies.append(clean_text(reply_article.inner_text()))
-                except Exception:
-                    pass
-                thread_page.close()
-            tweets_data.append({
-                "text": text,
-                "date": tweet_date,
-                "replies": engagement["replies"],
-                "retweets": engagement["retweets"],
-                "likes": engagement["likes"],
-                "views": engagement["views"],
-                "top_replies": " || ".join(replies)
-            })
-        browser.close()
-        tweets_data.sort(key=lambda t: (
-            t.get("views", 0),
-            t.get("likes", 0),
-            t.get("retweets", 0),
-            t.get("replies", 0)
-        ), reverse=True)
-        return tweets_data[:5]
-
-async def run_twitter_niche_crawler(niche: str = "cars"):
-    return await run_in_threadpool(scrape_twitter_niche, niche)
+            try:
+                replies = await _load_replies(thread, tweet_url)
+            finally:
+                memo[tweet_url].set_result(replies)
+
+        replier = Pipeline(consume, workers=TWITTER_REPLY_CONCURRENCY, size=top_k, scope=lambda: _thread_page(context, lean, capture))
+        harvest = _search_harvester(since_date, discovered=discovered)
+    else:
+        harvest = _search_harvester(since_date)
+
+    try:
+        tweets_data = await _load_search(context, url, harvest, lean, capture)
+        if replier is not None:
+            if not await replier.close(timeout=time_left("enrich")):
+                mark_incomplete("enrich")
+    finally:
+        if replier is not None:
+            await replier.cancel()
+            for tweet_url in speculative:
+                if not memo[tweet_url].done():
+                    memo[tweet_url].set_result([])
+
+    await _record_engagement(niche, tweets_data)
+    with timed("ranking"):
+        _rank_tweets(tweets_data)
+    top_tweets = tweets_data[:top_k]
+
+    # Replies are only needed for the tweets we return
+    if include_replies:
+        report("replies", tweets=len(top_tweets))
+        await fetch_top_replies(context, top_tweets, lean, memo=memo, capture=capture)
+    return top_tweets
+
+async def crawl_twitter_frontier(niche="cars", lean: bool = None, include_replies: bool = True, top_k: int = 5,
+                                 capture: bool = None):
+    # Imported here so crawlee is only needed when CRAWL_ENGINE=crawlee
+    from app.core.frontier import DETAIL, LISTING, Frontier, detail_request
+
+    capture = CAPTURE_MODE if capture is None else capture
+    url, since_date = _search_url(niche)
+    key = make_key("twitter", niche=niche, top_k=top_k, include_replies=include_replies, since=since_date)
+    async with Frontier("twitter", key) as frontier:
+        crawler = frontier.crawler(lean, browser_new_context_options={"storage_state": AUTH_FILE})
+
+        @crawler.router.handler(LISTING)
+        async def listing(context):
+            harvest = _search_harvester(since_date)
+            if capture:
+                # The search request was already sent during navigation, so capture from a reload
+                tweets = await _capture_search(context.page, context.request.url, harvest)
+            else:
+                tweets = await _harvest_search(context.page, harvest)
+            await _record_engagement(niche, tweets)
+            top_tweets = _rank_tweets(tweets)[:top_k]
+            if not include_replies:
+                await frontier.dataset.push_data(top_tweets)
+                return
+            # Threads already in the enrichment store skip their detail page
+            report("replies", tweets=len(top_tweets))
+            requests = []
+            for tweet in top_tweets:
+                known = await enrichment_store.get(tweet["url"]) if tweet["url"] else {}
+                if "replies" in known or not tweet["url"]:
+                    tweet["top_replies"] = " || ".join(known.get("replies", []))
+                    await frontier.dataset.push_data(tweet)
+                else:
+                    requests.append(detail_request(tweet["url"], tweet=tweet))
+            await context.add_requests(requests)
+
+        @crawler.router.handler(DETAIL)
+        async def thread(context):
+            tweet = context.request.user_data["tweet"]
+            with timed("replies", url=tweet["url"]):
+                replies = await _thread_reply_texts(context.page)
+            if replies:
+                await enrichment_store.put(tweet["url"], "twitter", replies=replies)
+            tweet["top_replies"] = " || ".join(replies)
+            await frontier.dataset.push_data(tweet)
+
+        @crawler.failed_request_handler
+        async def failed(context, error):
+            print(f"[WARN] Could not fetch {context.request.url}: {error}")
+            if context.request.label == DETAIL:
+                # The tweet is still returned, just without its replies
+                await frontier.dataset.push_data(context.request.user_data["tweet"])
+
+        tweets_data = await frontier.run(crawler, url)
+        # The storages are kept when the run raises, so calling again with the same parameters resumes it
+        await frontier.drop()
+
+    with timed("ranking"):
+        return _rank_tweets(tweets_data)[:top_k]
+
+async def scrape_twitter_niche(niche="cars", lean: bool = None, include_replies: bool = True, top_k: int = 5, capture: bool = None,
+                               deadline: float = None):
+    await ensure_twitter_auth()
+    with deadline_scope(deadline):
+        if CRAWL_ENGINE == "crawlee":
+            return await crawl_twitter_frontier(niche, lean=lean, include_replies=include_replies, top_k=top_k, capture=capture)
+        async with browser_pool.lease(storage_state=AUTH_FILE) as context:
+            return await crawl_twitter_niche(context, niche, lean=lean, include_replies=include_replies, top_k=top_k, capture=capture)
+
+async def run_twitter_niche_crawler(niche: str = "cars", lean: bool = None, include_replies: bool = True, capture: bool = None,
+                                    deadline: float = None):
+    return await scrape_twitter_niche(niche, lean=lean, include_replies=include_replies, capture=capture, deadline=deadline)
@@ -0,0 +1,104 @@
+import json
+import httpx
+from lxml import etree, html as lxml_html
+
+from app.core.config import YOUTUBE_BASE_URL, HTTP_MAX_CONNECTIONS, HTTP_TIMEOUT
+from app.core.payloads import runs_text
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+# Skips the EU cookie-consent interstitial
+COOKIES = {"CONSENT": "YES+", "SOCS": "CAI"}
+
+_client = None
+
+
+def get_http_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=YOUTUBE_BASE_URL,
+            headers=HEADERS,
+            cookies=COOKIES,
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _initial_json(text: str, name: str):
+    # Pull `var ytInitialData = {...};` style assignments out of the inline scripts
+    start = text.find(name)
+    while start != -1:
+        brace = text.find("{", start)
+        if brace != -1 and text[start + len(name):brace].strip(" \t=\"]") == "":
+            try:
+                value, _ = json.JSONDecoder().raw_decode(text, brace)
+                return value
+            except ValueError:
+                pass
+        start = text.find(name, start + len(name))
+    return None
+
+
+def _find_key(data, key):
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if key in item:
+                return item[key]
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return None
+
+
+def parse_watch_html(text: str):
+    tree = lxml_html.fromstring(text)
+    player = _initial_json(text, "ytInitialPlayerResponse") or {}
+    initial_data = _initial_json(text, "ytInitialData") or {}
+    microformat = (player.get("microformat") or {}).get("playerMicroformatRenderer") or {}
+
+    date = (tree.xpath('//meta[@itemprop="datePublished"]/@content') or [None])[0]
+    date = date or microformat.get("publishDate") or microformat.get("uploadDate")
+    if not date:
+        return None
+
+    views = (player.get("videoDetails") or {}).get("viewCount")
+    if views is None:
+        views = (tree.xpath('//meta[@itemprop="interactionCount"]/@content') or [None])[0]
+    views = int(views) if views and str(views).isdigit() else None
+
+    comment_count = runs_text(_find_key(initial_data, "commentCount"))
+    comments_disabled = bool(comment_count) and comment_count.split()[0] == "0"
+    message = runs_text(_find_key(_find_key(initial_data, "messageRenderer") or {}, "text"))
+    if message and ("Comments are turned off" in message or "disabled" in message):
+        comments_disabled = True
+
+    return {
+        "date": date,
+        "views": views,
+        "comment_count": comment_count,
+        "comments_disabled": comments_disabled,
+    }
+
+
+async def fetch_watch_metadata(path: str):
+    try:
+        response = await get_http_client().get(path)
+        response.raise_for_status()
+        return parse_watch_html(response.text)
+    except (httpx.HTTPError, ValueError, etree.LxmlError) as e:
+        print(f"[WARN] HTTP metadata fetch failed for {path}: {e}")
+        return None
@@ -0,0 +1 @@
+# Offline replay benchmarks for the crawlers
@@ -0,0 +1,87 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench.har import entry_body, entry_key, index_entries, load_entries
+
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class FixtureServer:
+    """Serves the documents of recorded HAR files from a local HTTP server."""
+
+    def __init__(self, har_paths, host: str = "127.0.0.1", port: int = 0):
+        entries = []
+        for path in har_paths:
+            entries.extend(load_entries(path))
+        self._index = {
+            "GET": index_entries(entries, "GET"),
+            "POST": index_entries(entries, "POST"),
+        }
+        self._served = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.misses = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _next_entry(self, method: str, key: str):
+        candidates = self._index.get(method, {}).get(key)
+        if not candidates:
+            return None
+        with self._lock:
+            # Repeated requests (e.g. search continuations) walk through the recording in order
+            count = self._served.get((method, key), 0)
+            self._served[(method, key)] = count + 1
+        return candidates[min(count, len(candidates) - 1)]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method):
+                length = int(self.headers.get("content-length") or 0)
+                if length:
+                    self.rfile.read(length)
+                server.requests += 1
+                entry = server._next_entry(method, entry_key(self.path))
+                if entry is None:
+                    server.misses += 1
+                    self.send_error(404, "Not recorded")
+                    return
+                body = entry_body(entry)
+                self.send_response(entry["response"]["status"] or 200)
+                for header in entry["response"].get("headers", []):
+                    if header["name"].lower() not in _SKIPPED_HEADERS:
+                        self.send_header(header["name"], header["value"])
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def reset(self):
+        with self._lock:
+            self._served = {}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,32 @@
+import base64
+import json
+from urllib.parse import urlsplit
+
+
+def load_entries(har_path: str):
+    with open(har_path, encoding="utf-8") as f:
+        return json.load(f)["log"]["entries"]
+
+
+def entry_key(url: str):
+    # Host-agnostic key so a recorded https://www.youtube.com/watch?v=x is served for http://127.0.0.1:port/watch?v=x
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def entry_body(entry):
+    content = entry["response"].get("content", {})
+    text = content.get("text") or ""
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+def index_entries(entries, method: str = None):
+    # key -> list of recorded responses, replayed in recording order
+    index = {}
+    for entry in entries:
+        if method and entry["request"]["method"] != method:
+            continue
+        index.setdefault(entry_key(entry["request"]["url"]), []).append(entry)
+    return index
@@ -0,0 +1,59 @@
+"""Run the capture-mode payload parsers over recorded HAR fixtures.
+
+    python -m bench.payloads bench/fixtures/twitter.har
+    python -m bench.payloads bench/fixtures/youtube.har --limit 3
+
+Prints what app.core.payloads extracts from every recorded search/thread
+response, without a browser, so parser changes can be checked against real
+payloads.
+"""
+import argparse
+import json
+
+from app.core.payloads import (
+    TWITTER_DETAIL_PATTERNS, TWITTER_SEARCH_PATTERNS, YOUTUBE_SEARCH_PATTERNS, twitter_tweets, youtube_videos,
+)
+from app.services.youtube_http import _initial_json
+from bench.har import entry_body, load_entries
+
+PARSERS = [
+    (YOUTUBE_SEARCH_PATTERNS, youtube_videos),
+    (TWITTER_SEARCH_PATTERNS + TWITTER_DETAIL_PATTERNS, twitter_tweets),
+]
+
+
+def parse_entry(entry):
+    url = entry["request"]["url"]
+    if "/results?" in url:
+        # Search page HTML: the first results are inlined as ytInitialData
+        return youtube_videos(_initial_json(entry_body(entry).decode("utf-8", "replace"), "ytInitialData") or {})
+    for patterns, parser in PARSERS:
+        if any(pattern in url for pattern in patterns):
+            try:
+                return parser(json.loads(entry_body(entry)))
+            except ValueError:
+                return None
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("har", nargs="+")
+    parser.add_argument("--limit", type=int, default=2, help="items printed per response")
+    args = parser.parse_args()
+
+    total = 0
+    for path in args.har:
+        for entry in load_entries(path):
+            items = parse_entry(entry)
+            if items is None:
+                continue
+            total += len(items)
+            print(f"{len(items):4} items  {entry['request']['method']} {entry['request']['url'][:120]}")
+            for item in items[:args.limit]:
+                print("      " + json.dumps(item, ensure_ascii=False)[:300])
+    print(f"{total} items parsed")
+
+
+if __name__ == "__main__":
+    main()
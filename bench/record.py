@@ -0,0 +1,71 @@
+"""Record live crawls into HAR fixtures for the offline benchmarks.
+
+    python -m bench.record --site youtube --query face-cream
+    python -m bench.record --site twitter --niche cars
+
+Fixtures are written to bench/fixtures/<site>.har (not committed).
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+# Every document must go through the browser to end up in the HAR, and one
+# browser keeps a single recording context per site
+os.environ["YOUTUBE_HTTP_FAST_PATH"] = "0"
+os.environ["BROWSER_POOL_SIZE"] = "1"
+os.environ.setdefault("ENRICH_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="bench-record-"), "enrichment.sqlite3"))
+
+from app.core.browser_pool import browser_pool  # noqa: E402
+from app.core.enrichment_store import enrichment_store  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+async def _scroll_niche_listing(count: int = 10):
+    # niche.py scrolls its own search listing; capture it with the pool browser
+    from niche import YOUTUBE_URL
+
+    async with browser_pool.lease() as context:
+        page = await context.new_page()
+        await page.goto(YOUTUBE_URL)
+        await page.wait_for_timeout(3000)
+        for _ in range(count):
+            await page.mouse.wheel(0, 2000)
+            await page.wait_for_timeout(1500)
+
+
+async def record(site: str, query: str, niche: str, top_k: int, output: str):
+    from app.services.crawler_service import run_youtube_crawler
+    from app.services.twitter_niche_service import scrape_twitter_niche
+
+    browser_pool.context_options = {"record_har_path": output, "record_har_content": "embed"}
+    try:
+        if site == "youtube":
+            results = await run_youtube_crawler(query, top_k=top_k)
+            await _scroll_niche_listing()
+        else:
+            results = await scrape_twitter_niche(niche, top_k=top_k)
+    finally:
+        # The HAR is only written once its context closes
+        await browser_pool.stop()
+        enrichment_store.close()
+    print(f"[INFO] Recorded {len(results)} {site} results into {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--site", choices=("youtube", "twitter"), required=True)
+    parser.add_argument("--query", default="face-cream")
+    parser.add_argument("--niche", default="cars")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    output = args.output or os.path.join(FIXTURE_DIR, f"{args.site}.har")
+    asyncio.run(record(args.site, args.query, args.niche, args.top_k, output))
+
+
+if __name__ == "__main__":
+    main()
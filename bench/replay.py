@@ -0,0 +1,78 @@
+from urllib.parse import urlsplit
+
+from bench.har import entry_body, entry_key, index_entries, load_entries
+
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+_LOCAL_HOSTS = {"127.0.0.1", "localhost"}
+
+
+class HarReplay:
+    """Fulfils browser requests from recorded HAR files.
+
+    Requests are matched by method and host-agnostic path+query; when the query
+    differs (Twitter search URLs embed today's date) the path alone is used.
+    Repeated requests replay the recording in order. Anything not recorded is
+    aborted, so a replay never reaches the network.
+    """
+
+    def __init__(self, har_paths):
+        entries = []
+        for path in har_paths:
+            entries.extend(load_entries(path))
+        self._exact = index_entries(entries)
+        self._by_path = {}
+        for entry in entries:
+            key = (entry["request"]["method"], urlsplit(entry["request"]["url"]).path)
+            self._by_path.setdefault(key, []).append(entry)
+        self._served = {}
+        self.pages_opened = 0
+        self.served = 0
+        self.misses = 0
+
+    def reset(self):
+        self._served = {}
+        self.pages_opened = 0
+        self.served = 0
+        self.misses = 0
+
+    def _next_entry(self, method: str, url: str):
+        key = entry_key(url)
+        candidates = [e for e in self._exact.get(key, []) if e["request"]["method"] == method]
+        if not candidates:
+            key = urlsplit(url).path
+            candidates = self._by_path.get((method, key), [])
+        if not candidates:
+            return None
+        count = self._served.get((method, key), 0)
+        self._served[(method, key)] = count + 1
+        return candidates[min(count, len(candidates) - 1)]
+
+    async def _handle(self, route):
+        request = route.request
+        if urlsplit(request.url).hostname in _LOCAL_HOSTS:
+            # The local fixture server answers these
+            await route.continue_()
+            return
+        entry = self._next_entry(request.method, request.url)
+        if entry is None:
+            self.misses += 1
+            await route.abort()
+            return
+        self.served += 1
+        headers = {
+            h["name"]: h["value"]
+            for h in entry["response"].get("headers", [])
+            if h["name"].lower() not in _SKIPPED_HEADERS
+        }
+        await route.fulfill(status=entry["response"]["status"] or 200, headers=headers, body=entry_body(entry))
+
+    def _count_page(self, page):
+        self.pages_opened += 1
+
+    async def install_context(self, context):
+        context.on("page", self._count_page)
+        await context.route("**/*", self._handle)
+
+    async def install_page(self, page):
+        self._count_page(page)
+        await page.route("**/*", self._handle)
@@ -0,0 +1,289 @@
+"""Replay recorded fixtures through the crawlers and report performance.
+
+    python -m bench.run --repeat 3 --output bench/results/HEAD.json
+    python -m bench.run --compare bench/results/main.json --threshold 0.2
+
+Every scenario runs offline: browser requests are fulfilled from the HAR
+fixtures (see bench.record) and the browserless YouTube fast path talks to a
+local fixture server serving the same recording. For each scenario the median
+over the repeats is reported for wall time, pages opened, CDP calls (commands
+sent by the Playwright driver) and peak RSS of this process plus its browsers.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench.fixture_server import FixtureServer
+from bench.replay import HarReplay
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+SCENARIOS = ("youtube", "twitter", "niche")
+# Lower is better for all of them; RSS is noisier than the counts
+METRICS = ("wall_seconds", "pages_opened", "cdp_calls", "peak_rss_mb")
+
+
+class RssSampler:
+    """Tracks peak RSS of this process and all of its children (the browsers)."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self._stop.is_set():
+            total = 0
+            try:
+                total = process.memory_info().rss
+                for child in process.children(recursive=True):
+                    try:
+                        total += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+            except psutil.Error:
+                pass
+            self.peak = max(self.peak, total)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    @property
+    def peak_mb(self):
+        return round(self.peak / 1024 / 1024, 1) if self._thread else None
+
+
+class ProtocolLog:
+    """Counts CDP commands from the Playwright driver's DEBUG=pw:protocol output.
+
+    The driver inherits our stderr, so fd 2 is pointed at a temp file for the
+    duration of the run.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(mode="w+b")
+        self._saved = None
+
+    def __enter__(self):
+        sys.stderr.flush()
+        self._saved = os.dup(2)
+        os.dup2(self._file.fileno(), 2)
+        return self
+
+    def __exit__(self, *exc):
+        sys.stderr.flush()
+        os.dup2(self._saved, 2)
+        os.close(self._saved)
+
+    def mark(self):
+        return os.fstat(self._file.fileno()).st_size
+
+    def count_since(self, offset: int):
+        self._file.seek(offset)
+        return sum(1 for line in self._file if b"pw:protocol SEND" in line)
+
+    def tail(self, lines: int = 20):
+        self._file.seek(0)
+        rest = [line for line in self._file if b"pw:protocol" not in line]
+        return b"".join(rest[-lines:]).decode("utf-8", "replace")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_environment(server: FixtureServer, workdir: str, capture: bool = False, pipeline: bool = False,
+                        lean: bool = False):
+    # Must happen before anything under app/ is imported
+    os.environ["DEBUG"] = "pw:protocol"
+    if capture:
+        os.environ["CAPTURE_MODE"] = "1"
+    if pipeline:
+        os.environ["PIPELINE_MODE"] = "1"
+    os.environ["LEAN_MODE"] = "1" if lean else "0"
+    os.environ["YOUTUBE_BASE_URL"] = server.base_url
+    os.environ["ENRICH_DB_PATH"] = os.path.join(workdir, "enrichment.sqlite3")
+    os.environ["ENGAGEMENT_DB_PATH"] = os.path.join(workdir, "engagement.sqlite3")
+    os.environ["CRAWLEE_STORAGE_DIR"] = os.path.join(workdir, "crawlee")
+    # The twitter crawl needs a storage state, but replayed responses ignore cookies
+    auth_file = os.path.join(workdir, "twitter_auth.json")
+    with open(auth_file, "w") as f:
+        json.dump({"cookies": [], "origins": []}, f)
+    return auth_file
+
+
+async def run_scenario(name: str, args, replay: HarReplay):
+    from app.services.crawler_service import run_youtube_crawler
+    from app.services.twitter_niche_service import scrape_twitter_niche
+
+    if name == "youtube":
+        return await run_youtube_crawler(args.query, top_k=args.top_k)
+    if name == "twitter":
+        return await scrape_twitter_niche(args.niche, top_k=args.top_k)
+    from niche import crawl_niche
+
+    return await crawl_niche(prepare_page=replay.install_page)
+
+
+async def measure(name: str, args, replay: HarReplay, server: FixtureServer, log: ProtocolLog):
+    from app.core.browser_pool import browser_pool
+    from app.core.enrichment_store import enrichment_store
+
+    runs = []
+    for _ in range(args.repeat):
+        # Cold per-URL cache every time, warm browsers as in the server
+        enrichment_store.close()
+        for path in glob.glob(enrichment_store.path + "*"):
+            os.remove(path)
+        replay.reset()
+        server.reset()
+        if name != "niche":
+            await browser_pool.start()
+
+        offset = log.mark()
+        with RssSampler() as rss:
+            started = time.perf_counter()
+            results = await run_scenario(name, args, replay)
+            wall = time.perf_counter() - started
+        await browser_pool.stop()
+
+        runs.append({
+            "wall_seconds": round(wall, 3),
+            "pages_opened": replay.pages_opened,
+            "cdp_calls": log.count_since(offset),
+            "peak_rss_mb": rss.peak_mb,
+            "items": len(results),
+            "replayed": replay.served + server.requests - server.misses,
+            "unrecorded": replay.misses + server.misses,
+        })
+
+    summary = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs if run[key] is not None]
+        summary[key] = statistics.median(values) if values else None
+    summary["runs"] = runs
+    return summary
+
+
+async def run_all(args, auth_file: str, replay: HarReplay, server: FixtureServer, log: ProtocolLog):
+    from app.core.browser_pool import browser_pool
+    from app.services import twitter_niche_service
+
+    twitter_niche_service.AUTH_FILE = auth_file
+    browser_pool.context_hooks.append(replay.install_context)
+
+    report = {}
+    for name in args.scenarios:
+        report[name] = await measure(name, args, replay, server, log)
+    return report
+
+
+def compare(current, baseline, threshold: float):
+    regressions = []
+    for name, metrics in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for metric in METRICS:
+            new, old = metrics.get(metric), before.get(metric)
+            if not new or not old:
+                continue
+            change = (new - old) / old
+            status = "REGRESSION" if change > threshold else "ok"
+            print(f"{name:8} {metric:13} {old:>10} -> {new:>10} ({change:+.1%}) {status}")
+            if change > threshold:
+                regressions.append((name, metric, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", dest="scenarios", action="append", choices=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--query", default="face-cream")
+    parser.add_argument("--niche", default="cars")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--capture", action="store_true", help="parse search results from captured JSON responses")
+    parser.add_argument("--pipeline", action="store_true", help="enrich listing items while scrolling continues")
+    parser.add_argument("--lean", action="store_true", help="block images, media, fonts and trackers")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative increase before failing")
+    args = parser.parse_args()
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    har_paths = sorted(glob.glob(os.path.join(args.fixtures, "*.har")))
+    if not har_paths:
+        parser.error(f"no HAR fixtures in {args.fixtures}, record some with `python -m bench.record`")
+
+    server = FixtureServer(har_paths).start()
+    replay = HarReplay(har_paths)
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        auth_file = prepare_environment(server, workdir, args.capture, args.pipeline, args.lean)
+        log = ProtocolLog()
+        try:
+            with log:
+                scenarios = asyncio.run(run_all(args, auth_file, replay, server, log))
+        except Exception:
+            print(log.tail(), file=sys.stderr)
+            raise
+        finally:
+            server.stop()
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixtures": [os.path.basename(path) for path in har_paths],
+        "repeat": args.repeat,
+        "capture": args.capture,
+        "pipeline": args.pipeline,
+        "lean": args.lean,
+        "scenarios": scenarios,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"[ERROR] {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
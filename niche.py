@@ -1,27 +1,14 @@
+from crawlee import Request
 from crawlee.crawlers import PlaywrightCrawler, PlaywrightCrawlingContext
 import asyncio
-import re
-from datetime import timedelta
 from tabulate import tabulate
 
-YOUTUBE_URL = "https://www.youtube.com/results?search_query=face-cream&sp=CAMSBAgDEAE%253D"
+from app.core.extract import extract_youtube_listing
+from app.core.parsing import is_within_window, parse_views
 
-def is_within_48_hours(upload_text):
-    match = re.match(r"(\d+)\s+(minute|hour|day)s? ago", upload_text)
-    if not match:
-        return False
-    value, unit = int(match.group(1)), match.group(2)
-    if unit == "minute":
-        delta = timedelta(minutes=value)
-    elif unit == "hour":
-        delta = timedelta(hours=value)
-    elif unit == "day":
-        delta = timedelta(days=value)
-    else:
-        return False
-    return delta <= timedelta(hours=48)
+YOUTUBE_URL = "https://www.youtube.com/results?search_query=face-cream&sp=CAMSBAgDEAE%253D"
 
-async def main():
+async def crawl_niche(prepare_page=None):
     crawler = PlaywrightCrawler(
         max_requests_per_crawl=1,
         headless=True,
@@ -29,9 +16,15 @@ async def main():
     )
     videos_data = []
 
-    @crawler.router.default_handler
-    async def request_handler(context: PlaywrightCrawlingContext):
-        await context.page.goto(YOUTUBE_URL)
+    if prepare_page:
+        # e.g. the benchmark harness routing the page to recorded fixtures
+        @crawler.pre_navigation_hook
+        async def pre_navigation(context: PlaywrightCrawlingContext):
+            await prepare_page(context.page)
+
+    @crawler.router.handler("LISTING")
+    async def listing_handler(context: PlaywrightCrawlingContext):
+        # The crawler has already navigated to the request URL
         try:
             consent_button = await context.page.query_selector('button[aria-label="Agree to the use of cookies and other data for the purposes described"]')
             if consent_button:
@@ -45,32 +38,20 @@ async def main():
             await context.page.wait_for_timeout(1000)
 
         await context.page.wait_for_selector('ytd-video-renderer', timeout=10000)
-        videos = await context.page.query_selector_all('ytd-video-renderer')
+        videos = await extract_youtube_listing(context.page)
         for video in videos:
-            title_el = await video.query_selector('#video-title')
-            if not title_el:
-                continue
-            url = await title_el.get_attribute('href')
+            url = video['href']
             if not url or not (url.startswith('/watch') or url.startswith('/shorts')):
                 continue
-            meta_items = await video.query_selector_all('span.inline-metadata-item')
+            meta_items = video['meta']
             if not meta_items or len(meta_items) < 2:
                 continue
-            title = await title_el.inner_text()
-            views_text = await meta_items[0].inner_text()
-            upload_text = await meta_items[1].inner_text()
-            if not is_within_48_hours(upload_text):
+            title = video['title']
+            views_text = meta_items[0]
+            upload_text = meta_items[1]
+            if not is_within_window(upload_text, 48):
                 continue
-            try:
-                views = views_text.replace(' views', '').replace(',', '').strip()
-                if 'K' in views:
-                    views = int(float(views.replace('K', '')) * 1_000)
-                elif 'M' in views:
-                    views = int(float(views.replace('M', '')) * 1_000_000)
-                else:
-                    views = int(views)
-            except Exception:
-                views = 0
+            views = parse_views(views_text)
             is_short = '/shorts/' in url
             videos_data.append({
                 "title": title,
@@ -80,9 +61,12 @@ async def main():
                 "is_short": is_short
             })
 
-    await crawler.run([YOUTUBE_URL])
+    await crawler.run([Request.from_url(YOUTUBE_URL, label="LISTING")])
+
+    return sorted(videos_data, key=lambda x: x['views'], reverse=True)[:5]
 
-    top_videos = sorted(videos_data, key=lambda x: x['views'], reverse=True)[:5]
+async def main():
+    top_videos = await crawl_niche()
     table = [
         [
             video['title'],
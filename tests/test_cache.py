@@ -0,0 +1,110 @@
+import asyncio
+import time
+import unittest
+
+from app.core.cache import MemoryBackend, ResultCache, make_key
+
+
+class MakeKeyTest(unittest.TestCase):
+    def test_normalizes_values(self):
+        self.assertEqual(
+            make_key("youtube_crawler", query="  Face   Cream ", top_k=5, window_hours=48, include_comments=True),
+            make_key("youtube_crawler", window_hours=48.0, include_comments=True, top_k=5.0, query="face cream"),
+        )
+
+    def test_skips_none_and_keeps_booleans(self):
+        self.assertEqual(make_key("twitter_niche_crawler", niche="cars", cursor=None, include_replies=True),
+                         "twitter_niche_crawler?include_replies=True&niche=cars")
+        self.assertNotEqual(make_key("x", flag=True), make_key("x", flag=1))
+
+    def test_different_values_differ(self):
+        self.assertNotEqual(make_key("youtube_crawler", query="a", window_hours=48),
+                            make_key("youtube_crawler", query="a", window_hours=24))
+
+
+class ResultCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def _crawl(self):
+        self.calls += 1
+        await self.release.wait()
+        return {"run": self.calls}
+
+    async def test_single_flight(self):
+        cache = ResultCache(MemoryBackend(), ttl=60, stale=0)
+        callers = [asyncio.create_task(cache.get_or_compute("k", self._crawl)) for _ in range(3)]
+        await asyncio.sleep(0)
+        self.release.set()
+        results = await asyncio.gather(*callers)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [{"run": 1}] * 3)
+        self.assertEqual(cache.coalesced, 2)
+        # Now cached
+        self.assertEqual(await cache.get_or_compute("k", self._crawl), {"run": 1})
+        self.assertEqual(cache.hits, 1)
+
+    async def test_cancelled_caller_does_not_cancel_shared_crawl(self):
+        cache = ResultCache(MemoryBackend(), ttl=60, stale=0)
+        first = asyncio.create_task(cache.get_or_compute("k", self._crawl))
+        second = asyncio.create_task(cache.get_or_compute("k", self._crawl))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.release.set()
+        self.assertEqual(await second, {"run": 1})
+
+    async def test_ttl_expiry(self):
+        cache = ResultCache(MemoryBackend(), ttl=60, stale=0)
+        self.release.set()
+        await cache.get_or_compute("k", self._crawl)
+        self.assertEqual(await cache.get_fresh("k"), {"run": 1})
+        entry = await cache.get("k")
+        entry["expires_at"] = time.time() - 1
+        self.assertIsNone(await cache.get_fresh("k"))
+        self.assertEqual(await cache.get_or_compute("k", self._crawl), {"run": 2})
+        self.assertEqual(cache.misses, 2)
+
+    async def test_refresh_bypasses_cache(self):
+        cache = ResultCache(MemoryBackend(), ttl=60, stale=0)
+        self.release.set()
+        await cache.get_or_compute("k", self._crawl)
+        self.assertEqual(await cache.get_or_compute("k", self._crawl, refresh=True), {"run": 2})
+
+    async def test_stale_while_revalidate(self):
+        cache = ResultCache(MemoryBackend(), ttl=60, stale=30)
+        self.release.set()
+        await cache.get_or_compute("k", self._crawl)
+        entry = await cache.get("k")
+        entry["expires_at"] = time.time() - 1
+        # The stale value comes back at once and a refresh runs in the background
+        self.assertEqual(await cache.get_or_compute("k", self._crawl), {"run": 1})
+        self.assertEqual(cache.stale_hits, 1)
+        await asyncio.gather(*cache._in_flight.values())
+        self.assertEqual(await cache.get_fresh("k"), {"run": 2})
+
+    async def test_past_stale_window_recomputes(self):
+        cache = ResultCache(MemoryBackend(), ttl=60, stale=30)
+        self.release.set()
+        await cache.get_or_compute("k", self._crawl)
+        entry = await cache.get("k")
+        entry["expires_at"] = time.time() - 31
+        self.assertEqual(await cache.get_or_compute("k", self._crawl), {"run": 2})
+        self.assertEqual(cache.stale_hits, 0)
+
+    async def test_lru_eviction(self):
+        backend = MemoryBackend(max_entries=2)
+        cache = ResultCache(backend, ttl=60, stale=0)
+        await cache.put("a", 1)
+        await cache.put("b", 2)
+        # Reading "a" makes "b" the least recently used
+        await cache.get("a")
+        await cache.put("c", 3)
+        self.assertEqual(len(backend), 2)
+        self.assertIsNone(await cache.get("b"))
+        self.assertEqual(await cache.get_fresh("a"), 1)
+        self.assertEqual(await cache.get_fresh("c"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
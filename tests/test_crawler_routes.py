@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.core.cache import MemoryBackend, ResultCache
+from app.main import app
+from app.routers import crawler
+from app.services.batch_service import run_batch_crawl
+
+
+class BatchCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResultCache(MemoryBackend(), ttl=60, stale=0)
+        self.crawls = []
+        patches = [
+            mock.patch.object(crawler, "result_cache", self.cache),
+            mock.patch.object(crawler, "dispatch", self._dispatch),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = TestClient(app)
+
+    async def _dispatch(self, fn, *args, **kwargs):
+        self.crawls.append(fn)
+        if fn is run_batch_crawl:
+            return {
+                "youtube": {query: [{"query": query}] for query in kwargs["youtube_queries"]},
+                "twitter": {niche: [{"niche": niche}] for niche in kwargs["twitter_niches"]},
+            }
+        return [{"crawled": True}]
+
+    def test_gets_serve_batch_results(self):
+        self.client.post("/batch_crawler", json={"youtube_queries": ["face cream"], "twitter_niches": ["cars"]})
+        self.assertEqual(self.client.get("/youtube_crawler", params={"query": "Face Cream"}).json(), [{"query": "face cream"}])
+        self.assertEqual(self.client.get("/twitter_niche_crawler", params={"niche": "cars"}).json(), [{"niche": "cars"}])
+        self.assertEqual(self.crawls, [run_batch_crawl])
+
+    def test_batch_parameters_are_part_of_the_key(self):
+        self.client.post("/batch_crawler", json={"youtube_queries": ["face cream"], "window_hours": 24})
+        self.assertEqual(self.client.get("/youtube_crawler", params={"query": "face cream", "window_hours": 24}).json(),
+                         [{"query": "face cream"}])
+        self.assertEqual(self.client.get("/youtube_crawler", params={"query": "face cream"}).json(), [{"crawled": True}])
+
+
+if __name__ == "__main__":
+    unittest.main()
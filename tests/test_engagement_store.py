@@ -0,0 +1,64 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from app.core.engagement_store import EngagementStore
+
+
+class EngagementStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "engagement.db")
+        self.store = EngagementStore(self.path, batch_size=100, flush_seconds=3600)
+        self.addCleanup(self.store.close)
+        self.now = time.time()
+
+    async def _record(self, hours_ago, site, niche, items):
+        with mock.patch("app.core.engagement_store.time.time", return_value=self.now - hours_ago * 3600):
+            await self.store.record(site, niche, items)
+
+    async def test_movers(self):
+        await self._record(3, "youtube", "Face Cream", [{"id": "a", "views": 100}, {"id": "b", "views": 1000}])
+        await self._record(1, "youtube", "face  cream", [
+            {"id": "a", "views": 700, "title": "Fast riser", "url": "https://www.youtube.com/watch?v=a"},
+            {"id": "b", "views": 1400},
+            {"id": "c", "views": 5000},
+        ])
+        movers = await self.store.movers("youtube", window_hours=24)
+        # a: +600 over 2h, b: +400 over 2h; c has a single snapshot
+        self.assertEqual([mover["item_id"] for mover in movers], ["a", "b"])
+        self.assertEqual(movers[0]["title"], "Fast riser")
+        self.assertEqual((movers[0]["first"], movers[0]["last"], movers[0]["delta"]), (100, 700, 600))
+        self.assertEqual(movers[0]["per_hour"], 300.0)
+        self.assertEqual(movers[0]["snapshots"], 2)
+
+    async def test_window_niche_and_metric(self):
+        await self._record(30, "twitter", "cars", [{"id": "old", "likes": 1}])
+        await self._record(3, "twitter", "cars", [{"id": "old", "likes": 2}, {"id": "t", "likes": 10}])
+        await self._record(3, "twitter", "bikes", [{"id": "other", "likes": 1}])
+        await self._record(1, "twitter", "cars", [{"id": "old", "likes": 3}, {"id": "t", "likes": 50}])
+        await self._record(1, "twitter", "bikes", [{"id": "other", "likes": 900}])
+        movers = await self.store.movers("twitter", metric="likes", window_hours=24, niche="Cars")
+        # "old" only counts from its first snapshot inside the window
+        self.assertEqual([(mover["item_id"], mover["delta"]) for mover in movers], [("t", 40), ("old", 1)])
+        self.assertEqual(await self.store.movers("youtube", window_hours=24), [])
+        with self.assertRaises(ValueError):
+            await self.store.movers("twitter", metric="shares")
+
+    async def test_flush_makes_snapshots_visible_to_other_processes(self):
+        await self._record(2, "youtube", "q", [{"id": "a", "views": 1}])
+        await self._record(1, "youtube", "q", [{"id": "a", "views": 5}])
+        # The API process reads the database with its own store instance
+        reader = EngagementStore(self.path)
+        self.addCleanup(reader.close)
+        self.assertEqual(await reader.movers("youtube"), [])
+        await self.store.flush()
+        self.assertEqual([mover["item_id"] for mover in await reader.movers("youtube")], ["a"])
+        self.assertEqual(self.store.stats()["pending"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from app.core.config import YOUTUBE_BASE_URL
+from app.services.crawler_service import _store_url
+from app.services.enrichment_service import classify_url
+
+
+class ClassifyUrlTest(unittest.TestCase):
+    def test_youtube(self):
+        for url in (
+            "https://www.youtube.com/watch?v=abc123&t=42s",
+            "https://m.youtube.com/watch?feature=share&v=abc123",
+            "https://youtu.be/abc123?si=tracking",
+            " https://youtube.com/watch?v=abc123 ",
+        ):
+            self.assertEqual(classify_url(url), ("youtube", "/watch?v=abc123"), url)
+        self.assertEqual(classify_url("https://www.youtube.com/shorts/xyz789"), ("youtube", "/shorts/xyz789"))
+
+    def test_twitter(self):
+        for url in (
+            "https://x.com/carfan/status/1790000000000000001",
+            "https://mobile.twitter.com/carfan/status/1790000000000000001/photo/1",
+            "https://twitter.com/carfan/status/1790000000000000001?s=20",
+        ):
+            self.assertEqual(classify_url(url), ("twitter", "https://twitter.com/carfan/status/1790000000000000001"), url)
+
+    def test_unsupported(self):
+        for url in (
+            "https://www.youtube.com/@channel",
+            "https://x.com/carfan",
+            "https://example.com/watch?v=abc123",
+            "not a url",
+        ):
+            self.assertEqual(classify_url(url), (None, None), url)
+
+
+class StoreUrlTest(unittest.TestCase):
+    def test_listing_hrefs_share_the_enrich_row(self):
+        kind, path = classify_url("https://youtu.be/abc123")
+        canonical = _store_url(f"{YOUTUBE_BASE_URL}{path}")
+        self.assertEqual(canonical, f"{YOUTUBE_BASE_URL}/watch?v=abc123")
+        for href in ("/watch?v=abc123&pp=ygUKZmFjZSBjcmVhbQ%3D%3D", "/watch?v=abc123&pp=other", "/shorts/abc123"):
+            self.assertEqual(_store_url(href), canonical, href)
+            self.assertEqual(_store_url(f"{YOUTUBE_BASE_URL}{href}"), canonical, href)
+
+
+if __name__ == "__main__":
+    unittest.main()
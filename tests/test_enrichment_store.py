@@ -0,0 +1,50 @@
+import os
+import tempfile
+import time
+import unittest
+
+from app.core.enrichment_store import EnrichmentStore
+
+
+class EnrichmentStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = EnrichmentStore(os.path.join(directory.name, "enrichment.db"),
+                                     date_ttl=3600, comments_ttl=60, replies_ttl=60)
+        self.addCleanup(self.store.close)
+
+    async def test_missing_url(self):
+        self.assertEqual(await self.store.get("https://www.youtube.com/watch?v=nope"), {})
+        self.assertEqual(self.store.misses, 1)
+
+    async def test_fields_merge(self):
+        url = "https://www.youtube.com/watch?v=abc"
+        await self.store.put(url, "youtube", published="2024-05-14")
+        await self.store.put(url, "youtube", comments=["first!"], comments_disabled=False)
+        # A later write without a field keeps the stored one
+        await self.store.put(url, "youtube", published="2024-05-14")
+        self.assertEqual(await self.store.get(url), {
+            "published": "2024-05-14",
+            "comments": ["first!"],
+            "comments_disabled": False,
+        })
+        self.assertEqual(self.store.hits, 1)
+
+    async def test_replies(self):
+        url = "https://twitter.com/carfan/status/1"
+        await self.store.put(url, "twitter", replies=[{"author": "a", "text": "b"}])
+        self.assertEqual(await self.store.get(url), {"replies": [{"author": "a", "text": "b"}]})
+
+    async def test_fields_expire_separately(self):
+        url = "https://www.youtube.com/watch?v=abc"
+        await self.store.put(url, "youtube", published="2024-05-14", comments=[], comments_disabled=True)
+        with self.store._lock:
+            conn = self.store._connect()
+            conn.execute("UPDATE enrichment SET comments_fetched_at = ?", (time.time() - 120,))
+            conn.commit()
+        self.assertEqual(await self.store.get(url), {"published": "2024-05-14"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+
+from app.core.extract import SEEN_ATTRIBUTE, extract_tweets, extract_youtube_listing
+from app.core.harvest import Harvester
+
+
+def _items(*ids, outside=()):
+    return [{"id": item_id, "outside": item_id in outside} for item_id in ids]
+
+
+class HarvesterTest(unittest.TestCase):
+    def test_dedupe(self):
+        harvest = Harvester(lambda item: item["id"], target=0)
+        self.assertEqual([item["id"] for item in harvest.add(_items("a", "b"))], ["a", "b"])
+        # A remounted "b" and an item without a key are not new
+        self.assertEqual([item["id"] for item in harvest.add(_items("b", "c", None))], ["c"])
+        self.assertEqual([item["id"] for item in harvest.items], ["a", "b", "c"])
+        self.assertEqual(harvest.duplicates, 1)
+        self.assertFalse(harvest.done)
+
+    def test_target(self):
+        harvest = Harvester(lambda item: item["id"], target=3)
+        harvest.add(_items("a", "b"))
+        self.assertFalse(harvest.target_reached)
+        harvest.add(_items("b", "c"))
+        self.assertTrue(harvest.target_reached)
+        self.assertTrue(harvest.done)
+
+    def test_window_cutoff(self):
+        harvest = Harvester(lambda item: item["id"], target=0, outside_window=lambda item: item["outside"], patience=3)
+        harvest.add(_items("a", "b", "c", outside=("b", "c")))
+        self.assertFalse(harvest.past_window)
+        # An in-window item resets the streak
+        harvest.add(_items("d", "e", "f", outside=("e", "f")))
+        self.assertFalse(harvest.past_window)
+        # Duplicates do not count towards it
+        harvest.add(_items("e", "f"))
+        self.assertFalse(harvest.past_window)
+        harvest.add(_items("g", outside=("g",)))
+        self.assertTrue(harvest.past_window)
+        self.assertTrue(harvest.done)
+
+    def test_hand_off(self):
+        handed = []
+
+        async def discovered(items):
+            handed.append([item["id"] for item in items])
+
+        async def run():
+            harvest = Harvester(lambda item: item["id"], target=0, discovered=discovered)
+            harvest.add(_items("a", "b"))
+            harvest.add(_items("b", "c"))
+            await harvest.hand_off()
+            # Nothing new since the last step
+            await harvest.hand_off()
+            harvest.add(_items("d"))
+            await harvest.hand_off()
+
+        asyncio.run(run())
+        self.assertEqual(handed, [["a", "b", "c"], ["d"]])
+
+
+class _Page:
+    def __init__(self):
+        self.calls = []
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        return []
+
+
+class FreshExtractionTest(unittest.TestCase):
+    def test_seen_marker_is_passed_in(self):
+        # wait_for_new_elements looks for SEEN_ATTRIBUTE; the extractors must mark with the same one
+        page = _Page()
+        asyncio.run(extract_youtube_listing(page, fresh=True))
+        asyncio.run(extract_tweets(page, fresh=True))
+        for script, arg in page.calls:
+            self.assertIn(SEEN_ATTRIBUTE, arg)
+            self.assertNotIn(SEEN_ATTRIBUTE, script)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import time
+import unittest
+
+from app.core.jobs import JobManager, JobQueueFull
+from app.core.progress import report
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class JobManagerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+        self.manager = JobManager(workers=1, max_queue=2, retention=60)
+        self.manager.register("echo", self._echo)
+        self.manager.register("block", self._block)
+        await self.manager.start()
+
+    async def asyncTearDown(self):
+        await asyncio.wait_for(self.manager.stop(), 1)
+
+    async def _echo(self, value):
+        report("listing", found=value)
+        return {"value": value}
+
+    async def _block(self):
+        self.started.set()
+        await self.release.wait()
+        return "released"
+
+    async def test_submit(self):
+        job = self.manager.submit("echo", {"value": 3})
+        self.assertEqual(job.status, "queued")
+        await asyncio.wait_for(self.manager._queue.join(), 1)
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.result, {"value": 3})
+        self.assertEqual(job.progress, {"stage": "listing", "found": 3})
+        self.assertIs(self.manager.get(job.id), job)
+        with self.assertRaises(KeyError):
+            self.manager.submit("missing", {})
+
+    async def test_cancel_running_job(self):
+        job = self.manager.submit("block", {})
+        await asyncio.wait_for(self.started.wait(), 1)
+        self.manager.cancel(job.id)
+        await _settle()
+        self.assertEqual(job.status, "cancelled")
+        # The worker survives a job cancel and takes the next job
+        follow_up = self.manager.submit("echo", {"value": 1})
+        await asyncio.wait_for(self.manager._queue.join(), 1)
+        self.assertEqual(follow_up.status, "succeeded")
+
+    async def test_cancel_queued_job(self):
+        self.manager.submit("block", {})
+        await asyncio.wait_for(self.started.wait(), 1)
+        queued = self.manager.submit("echo", {"value": 1})
+        self.manager.cancel(queued.id)
+        self.assertEqual(queued.status, "cancelled")
+        self.release.set()
+        await asyncio.wait_for(self.manager._queue.join(), 1)
+        self.assertIsNone(queued.result)
+
+    async def test_queue_full(self):
+        self.manager.submit("block", {})
+        await asyncio.wait_for(self.started.wait(), 1)
+        self.manager.submit("echo", {"value": 1})
+        self.manager.submit("echo", {"value": 2})
+        with self.assertRaises(JobQueueFull):
+            self.manager.submit("echo", {"value": 3})
+        self.assertEqual(self.manager.stats()["queued"], 2)
+        self.assertEqual(self.manager.stats()["running"], 1)
+
+    async def test_retention(self):
+        old = self.manager.submit("echo", {"value": 1})
+        await asyncio.wait_for(self.manager._queue.join(), 1)
+        old.finished_at = time.time() - 120
+        self.manager.submit("echo", {"value": 2})
+        self.assertIsNone(self.manager.get(old.id))
+
+    async def test_stop_during_job(self):
+        job = self.manager.submit("block", {})
+        await asyncio.wait_for(self.started.wait(), 1)
+        await asyncio.wait_for(self.manager.stop(), 1)
+        self.assertEqual(job.status, "cancelled")
+        self.assertEqual(self.manager.stats()["running"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import unittest
+
+from app.core.payloads import runs_text, twitter_replies, twitter_tweets, youtube_has_more, youtube_videos
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class YoutubePayloadTest(unittest.TestCase):
+    def test_initial_data(self):
+        payload = _fixture("youtube_search_initial.json")
+        videos = youtube_videos(payload)
+        self.assertEqual([video["id"] for video in videos], ["vid00000001", "vid00000002"])
+        self.assertEqual(videos[0], {
+            "id": "vid00000001",
+            "title": "Best face cream 2024",
+            "path": "/watch?v=vid00000001",
+            "views": 12345,
+            "uploaded": "3 hours ago",
+            "length": "8:21",
+            "channel": "Skin Lab",
+        })
+        self.assertEqual(videos[1]["views"], 0)
+        self.assertIsNone(videos[1]["length"])
+        self.assertTrue(youtube_has_more(payload))
+
+    def test_continuation(self):
+        payload = _fixture("youtube_search_continuation.json")
+        videos = youtube_videos(payload)
+        self.assertEqual([(video["id"], video["views"], video["uploaded"]) for video in videos],
+                         [("vid00000003", 987, "Streamed 5 hours ago")])
+        self.assertFalse(youtube_has_more(payload))
+
+    def test_runs_text(self):
+        self.assertEqual(runs_text({"runs": [{"text": "a"}, {"text": "b"}]}), "ab")
+        self.assertEqual(runs_text({"simpleText": "c"}), "c")
+        self.assertIsNone(runs_text(None))
+
+
+class TwitterPayloadTest(unittest.TestCase):
+    def test_search_timeline(self):
+        tweets = twitter_tweets(_fixture("twitter_search_timeline.json"))
+        # The tombstone and the cursor entry carry no tweet
+        self.assertEqual([tweet["id"] for tweet in tweets], ["1790000000000000001", "1790000000000000002"])
+        self.assertEqual(tweets[0], {
+            "id": "1790000000000000001",
+            "text": "New EV sedan spotted testing https://t.co/x",
+            "date": "2024-05-14",
+            "created_at": "2024-05-14T16:30:00+00:00",
+            "author": "carfan",
+            "url": "https://twitter.com/carfan/status/1790000000000000001",
+            "replies": 12,
+            "retweets": 30,
+            "likes": 410,
+            "quotes": 4,
+            "views": 58210,
+            "conversation_id": "1790000000000000001",
+            "in_reply_to": None,
+        })
+
+    def test_visibility_wrapper_and_note_tweet(self):
+        tweet = twitter_tweets(_fixture("twitter_search_timeline.json"))[1]
+        self.assertEqual(tweet["author"], "gearhead")
+        self.assertTrue(tweet["text"].startswith("Long-form review"))
+        self.assertEqual(tweet["url"], "https://twitter.com/gearhead/status/1790000000000000002")
+
+    def test_replies(self):
+        payload = _fixture("twitter_tweet_detail.json")
+        replies = twitter_replies(payload, "1790000000000000001")
+        # Direct replies only, in thread order, capped at three; the nested reply is not one
+        self.assertEqual([reply["author"] for reply in replies], ["ev_owner", "skeptic", "wheels"])
+        self.assertEqual(replies[0]["text"], "Range looks better than last year")
+
+
+if __name__ == "__main__":
+    unittest.main()
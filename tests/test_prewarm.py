@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.core.cache import MemoryBackend, ResultCache
+from app.core.prewarm import PrewarmScheduler
+from app.main import app
+from app.routers import crawler, prewarm
+
+
+async def _prewarmed(value):
+    return value
+
+
+async def _no_crawl(*args, **kwargs):
+    raise AssertionError("the endpoint crawled instead of serving the pre-warmed entry")
+
+
+class PrewarmCacheHitTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResultCache(MemoryBackend(), ttl=60, stale=0)
+        patches = [
+            mock.patch.object(crawler, "result_cache", self.cache),
+            mock.patch.object(crawler, "dispatch", _no_crawl),
+            mock.patch.object(prewarm, "dispatch", lambda fn, name: _prewarmed([{"prewarmed": name}])),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _prewarm(self, youtube_queries=(), twitter_niches=()):
+        scheduler = PrewarmScheduler(interval=3600, jitter=0, cache=self.cache)
+        prewarm.add_targets(scheduler, youtube_queries, twitter_niches)
+
+        async def run():
+            await scheduler.start()
+            scheduler.trigger()
+            while any(target.runs == 0 for target in scheduler.targets.values()):
+                await asyncio.sleep(0.01)
+            await scheduler.stop()
+
+        asyncio.run(run())
+
+    def test_youtube_get_serves_prewarmed_entry(self):
+        self._prewarm(youtube_queries=["Face Cream"])
+        response = TestClient(app).get("/youtube_crawler", params={"query": "face cream"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{"prewarmed": "Face Cream"}])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_twitter_get_serves_prewarmed_entry(self):
+        self._prewarm(twitter_niches=["cars"])
+        response = TestClient(app).get("/twitter_niche_crawler", params={"niche": "cars"})
+        self.assertEqual(response.json(), [{"prewarmed": "cars"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
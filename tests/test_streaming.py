@@ -0,0 +1,44 @@
+import asyncio
+import unittest
+
+from app.core.progress import report
+from app.core.streaming import cached_events, crawl_events
+
+
+async def _collect(events):
+    return [message async for message in events]
+
+
+class StreamingTest(unittest.TestCase):
+    def test_live_and_cached_summaries_match(self):
+        async def crawl():
+            report("item", item={"id": 1})
+            return [{"id": 1}]
+
+        live = asyncio.run(_collect(crawl_events(crawl)))
+        cached = asyncio.run(_collect(cached_events([{"id": 1}])))
+        self.assertEqual(live[0], ("item", {"id": 1}))
+        self.assertEqual(cached[0], ("item", {"id": 1}))
+        self.assertEqual(live[-1], ("summary", {"results": [{"id": 1}], "complete": True, "cached": False}))
+        self.assertEqual(cached[-1], ("summary", {"results": [{"id": 1}], "complete": True, "cached": True}))
+
+    def test_incomplete_crawl_is_not_cached(self):
+        stored = []
+
+        async def crawl():
+            report("incomplete", stage="listing")
+            return []
+
+        async def on_complete(results):
+            stored.append(results)
+
+        events = asyncio.run(_collect(crawl_events(crawl, on_complete=on_complete)))
+        self.assertEqual(events, [
+            ("incomplete", {"stage": "listing"}),
+            ("summary", {"results": [], "complete": False, "cached": False}),
+        ])
+        self.assertEqual(stored, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import queue
+import unittest
+
+from app.core.workers import WorkerCrashed, WorkerPool
+
+
+class _FakeProcess:
+    def __init__(self, target=None, args=(), name=None, daemon=None):
+        self.alive = False
+        self.exitcode = None
+        self.pid = None
+
+    def start(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def join(self, timeout=None):
+        self.alive = False
+
+    def kill(self):
+        self.alive = False
+
+
+class _FakeContext:
+    # Thread queues and inert processes: the test plays the worker side itself
+    Queue = queue.Queue
+    Process = _FakeProcess
+
+
+async def _until(condition, timeout=3):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+async def _crawl():
+    return "unused"
+
+
+class WorkerPoolRestartTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.pool = WorkerPool(processes=1, restart_delay=0.2)
+        self.pool._ctx = _FakeContext()
+        await self.pool.start()
+        self.worker = self.pool._workers[0]
+
+    async def asyncTearDown(self):
+        await asyncio.wait_for(self.pool.stop(), 5)
+
+    def _crash(self):
+        self.worker.process.alive = False
+        self.worker.process.exitcode = -9
+
+    async def _answer(self, tasks, result):
+        await _until(lambda: not tasks.empty())
+        message = tasks.get_nowait()
+        self.assertEqual(message[0], "run")
+        self.pool._results.put(("done", message[1], result))
+
+    async def test_run(self):
+        call = asyncio.create_task(self.pool.run(_crawl))
+        await self._answer(self.worker.tasks, "ok")
+        self.assertEqual(await asyncio.wait_for(call, 1), "ok")
+
+    async def test_call_during_restart_waits_for_new_worker(self):
+        old_tasks = self.worker.tasks
+        self._crash()
+        await _until(lambda: self.worker.restarting)
+        call = asyncio.create_task(self.pool.run(_crawl))
+        await _until(lambda: self.worker.restarts == 1)
+        self.assertIsNot(self.worker.tasks, old_tasks)
+        self.assertTrue(old_tasks.empty())
+        await self._answer(self.worker.tasks, "after restart")
+        self.assertEqual(await asyncio.wait_for(call, 1), "after restart")
+
+    async def test_call_right_after_crash_is_held(self):
+        # The crash is not detected yet, but the dead worker is already skipped
+        self._crash()
+        call = asyncio.create_task(self.pool.run(_crawl))
+        await _until(lambda: self.worker.restarts == 1)
+        await self._answer(self.worker.tasks, "held")
+        self.assertEqual(await asyncio.wait_for(call, 1), "held")
+
+    async def test_in_flight_call_fails_on_crash(self):
+        call = asyncio.create_task(self.pool.run(_crawl))
+        await _until(lambda: not self.worker.tasks.empty())
+        self._crash()
+        with self.assertRaises(WorkerCrashed):
+            await asyncio.wait_for(call, 3)
+        self.assertEqual(self.pool.in_flight, 0)
+
+    async def test_stop_releases_waiting_calls(self):
+        self._crash()
+        await _until(lambda: self.worker.restarting)
+        call = asyncio.create_task(self.pool.run(_crawl))
+        await asyncio.sleep(0)
+        await self.pool.stop()
+        with self.assertRaises(WorkerCrashed):
+            await asyncio.wait_for(call, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
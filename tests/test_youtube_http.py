@@ -0,0 +1,36 @@
+import os
+import unittest
+
+from app.services.youtube_http import parse_watch_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class ParseWatchHtmlTest(unittest.TestCase):
+    def test_watch_page(self):
+        metadata = parse_watch_html(_fixture("youtube_watch.html"))
+        # The meta tag wins for the date, the player response for the (more current) view count
+        self.assertEqual(metadata["date"], "2024-05-14T09:30:00-07:00")
+        self.assertEqual(metadata["views"], 48217)
+        self.assertEqual(metadata["comment_count"], "1.2K")
+        self.assertFalse(metadata["comments_disabled"])
+
+    def test_comments_turned_off(self):
+        metadata = parse_watch_html(_fixture("youtube_watch_comments_off.html"))
+        # No meta tags: date from the player microformat
+        self.assertEqual(metadata["date"], "2024-06-01T18:00:00-07:00")
+        self.assertEqual(metadata["views"], 903)
+        self.assertIsNone(metadata["comment_count"])
+        self.assertTrue(metadata["comments_disabled"])
+
+    def test_page_without_date(self):
+        self.assertIsNone(parse_watch_html("<html><body><p>Something went wrong</p></body></html>"))
+
+
+if __name__ == "__main__":
+    unittest.main()